@@ -6,19 +6,51 @@ variables or a .env file. It provides a Config class that reads GitLab API crede
 and project information needed to interact with the GitLab API.
 
 Example:
-    config = Config()
+    config = get_config()
     config.validate()  # Raises ValueError if required settings are missing
 """
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
-# Load environment variables from .env file if it exists
-# This allows users to store their credentials in a .env file instead of setting
-# environment variables manually
-load_dotenv()
+# Settings that may come from the environment or a .env file
+_SETTINGS = ('GITLAB_URL', 'GITLAB_TOKEN', 'GITLAB_PROJECT_ID')
 
+# Whether the .env file has already been considered in this process
+_dotenv_loaded = False
 
+
+def _ensure_dotenv() -> None:
+    """
+    Load environment variables from a .env file, at most once per process.
+    
+    This allows users to store their credentials in a .env file instead of setting
+    environment variables manually. Values already present in the environment
+    always take precedence, so the file is skipped entirely when every setting is
+    already set (the usual case in containers and CI), or when
+    GITLAB_SECRETS_SKIP_DOTENV=1.
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    
+    if os.environ.get('GITLAB_SECRETS_SKIP_DOTENV') == '1':
+        return
+    if all(os.environ.get(name) for name in _SETTINGS):
+        return
+    load_dotenv()
+
+
+def _getenv(name: str, default: str) -> str:
+    """Read a setting from the environment, loading the .env file on first use."""
+    _ensure_dotenv()
+    return os.getenv(name, default)
+
+
+@dataclass(frozen=True)
 class Config:
     """
     Configuration class for GitLab API settings.
@@ -27,6 +59,10 @@ class Config:
     It reads configuration from environment variables or a .env file and provides
     validation to ensure all required settings are present.
     
+    Config is immutable once created: environment variables are read a single
+    time when the instance is built. Use get_config() to share one instance
+    across the whole process.
+    
     Attributes:
         gitlab_url (str): The base URL of the GitLab instance (default: https://gitlab.com)
         gitlab_token (str): Personal access token for GitLab API authentication
@@ -39,52 +75,83 @@ class Config:
         >>> config.validate()  # Raises ValueError if token or project_id is missing
     """
     
-    def __init__(self):
-        """
-        Initialize the Config object by reading environment variables.
-        
-        Reads configuration from environment variables with fallback defaults:
-        - GITLAB_URL: defaults to 'https://gitlab.com' (public GitLab)
-        - GITLAB_TOKEN: required for API authentication (no default)
-        - GITLAB_PROJECT_ID: required to identify the project (no default)
-        """
-        # Base URL of the GitLab instance (supports self-hosted GitLab)
-        self.gitlab_url = os.getenv('GITLAB_URL', 'https://gitlab.com')
-        
-        # Personal access token for authenticating API requests
-        # Get this from: Settings > Access Tokens in GitLab
-        self.gitlab_token = os.getenv('GITLAB_TOKEN', '')
-        
-        # Project ID where CI/CD variables will be managed
-        # Find this in the project's Settings > General section
-        self.project_id = os.getenv('GITLAB_PROJECT_ID', '')
+    # Base URL of the GitLab instance (supports self-hosted GitLab)
+    # Read from GITLAB_URL, defaults to 'https://gitlab.com' (public GitLab)
+    gitlab_url: str = field(
+        default_factory=lambda: _getenv('GITLAB_URL', 'https://gitlab.com'))
+    
+    # Personal access token for authenticating API requests
+    # Get this from: Settings > Access Tokens in GitLab
+    gitlab_token: str = field(
+        default_factory=lambda: _getenv('GITLAB_TOKEN', ''), repr=False)
+    
+    # Project ID where CI/CD variables will be managed
+    # Find this in the project's Settings > General section
+    project_id: str = field(
+        default_factory=lambda: _getenv('GITLAB_PROJECT_ID', ''))
     
     def validate(self) -> bool:
         """
         Validate that required configuration is present.
         
         Checks that both the GitLab token and project ID are set. These are
-        essential for making API requests to GitLab.
+        essential for making API requests to GitLab. All missing settings are
+        reported together in a single error.
         
         Returns:
             bool: True if validation passes
             
         Raises:
-            ValueError: If GITLAB_TOKEN is not set
-            ValueError: If GITLAB_PROJECT_ID is not set
+            ValueError: If GITLAB_TOKEN and/or GITLAB_PROJECT_ID is not set
             
         Example:
             >>> config = Config()
             >>> config.validate()  # Raises ValueError if missing required fields
             True
         """
-        # Ensure the authentication token is provided
-        if not self.gitlab_token:
-            raise ValueError("GITLAB_TOKEN environment variable is required")
-        
-        # Ensure the project ID is provided so we know which project to manage
-        if not self.project_id:
-            raise ValueError("GITLAB_PROJECT_ID environment variable is required")
+        # The token authenticates API requests and the project ID tells us which
+        # project to manage; collect every missing one in a single pass
+        missing = [
+            name for name, value in (
+                ('GITLAB_TOKEN', self.gitlab_token),
+                ('GITLAB_PROJECT_ID', self.project_id),
+            )
+            if not value
+        ]
+        if missing:
+            noun = "variable is" if len(missing) == 1 else "variables are"
+            raise ValueError(f"{', '.join(missing)} environment {noun} required")
         
         return True
 
+
+# Process-wide configuration instance, created on first use, and the values
+# of _SETTINGS it was built from
+_config: Optional[Config] = None
+_config_settings: Optional[Tuple[Optional[str], ...]] = None
+
+
+def get_config() -> Config:
+    """
+    Return the process-wide Config instance for the current settings.
+    
+    The instance is built on first use and shared by later calls for as long
+    as GITLAB_URL, GITLAB_TOKEN and GITLAB_PROJECT_ID keep their values. If
+    any of them changes (e.g. a test or script fixes a missing setting), a new
+    immutable instance is built, so an invalid configuration is never kept.
+    
+    Returns:
+        Config: The shared configuration object
+        
+    Example:
+        >>> config = get_config()
+        >>> config is get_config()
+        True
+    """
+    global _config, _config_settings
+    _ensure_dotenv()
+    settings = tuple(os.environ.get(name) for name in _SETTINGS)
+    if _config is None or settings != _config_settings:
+        _config = Config()
+        _config_settings = settings
+    return _config
@@ -19,11 +19,75 @@ Example:
     # List all variables
     variables = client.list_variables()
 """
+import collections
+import functools
+import itertools
+import re
 import requests
-from typing import List, Dict, Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import AbstractSet, Iterator, List, Dict, Optional, Any, Tuple
 from urllib.parse import quote
+from urllib3.util.retry import Retry
 from config import Config
 
+# orjson is an optional, faster drop-in for JSON encoding/decoding of API payloads
+# Install with: pip install gitlab-secrets-manager[fast]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Seconds for which a cached listing answers use_cache=True calls; the client
+# may live for a whole process, and writes made elsewhere don't invalidate it
+_CACHE_TTL = 10.0
+
+# Headers for requests whose body was serialized by orjson
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+@functools.lru_cache(maxsize=8)
+def _variables_url(base_url: str, project_id: str) -> str:
+    """
+    Build the variables endpoint URL for a project (memoized per project).
+    
+    The project ID is URL-encoded so namespaced paths (e.g. 'group/project')
+    work as well as numeric IDs.
+    """
+    return f"{base_url}/projects/{quote(project_id, safe='')}/variables"
+
+
+# Keys made only of characters GitLab allows in variable names need no encoding
+_SAFE_KEY_RE = re.compile(r'\A[A-Za-z0-9_]+\Z')
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_key(key: str) -> str:
+    """URL-encode a variable key for use in a URL path (memoized per key)."""
+    if _SAFE_KEY_RE.match(key):
+        return key
+    return quote(key, safe='')
+
+
+class VariableConflictError(Exception):
+    """
+    Base class for the error create_variable() raises when the variable
+    already exists (HTTP 409), whichever client (sync or async) made the call.
+    """
+
+
+class ConflictError(requests.exceptions.HTTPError, VariableConflictError):
+    """Raised by create_variable() when the variable already exists (HTTP 409)."""
+
 
 class GitLabClient:
     """
@@ -36,13 +100,14 @@ class GitLabClient:
     Attributes:
         config (Config): Configuration object containing API credentials
         base_url (str): Base URL for GitLab API v4 endpoints
-        headers (dict): HTTP headers including authentication token
+        variables_url (str): Full URL of the project's variables endpoint
+        session (requests.Session): Persistent HTTP session reused for all requests
     
     Example:
         >>> config = Config()
         >>> config.validate()
-        >>> client = GitLabClient(config)
-        >>> variables = client.list_variables()
+        >>> with GitLabClient(config) as client:
+        ...     variables = client.list_variables()
     """
     
     def __init__(self, config: Config):
@@ -61,23 +126,97 @@ class GitLabClient:
         # Format: https://gitlab.com/api/v4
         self.base_url = f"{config.gitlab_url}/api/v4"
         
-        # Set up HTTP headers for authentication
+        # Precompute the project's variables endpoint once; per-variable URLs
+        # only need the encoded key appended
+        # Format: https://gitlab.com/api/v4/projects/123/variables
+        self.variables_url = _variables_url(self.base_url, str(config.project_id))
+        
+        # Reuse a single session so TCP/TLS connections are kept alive across
+        # requests (pagination and bulk operations hit the same host repeatedly)
+        self.session = requests.Session()
+        
+        # Set up the authentication header once for every request
         # PRIVATE-TOKEN is GitLab's authentication method for personal access tokens
-        self.headers = {
-            'PRIVATE-TOKEN': config.gitlab_token,
-            'Content-Type': 'application/json'
-        }
+        # Content-Type is only sent with requests that carry a JSON body
+        self.session.headers['PRIVATE-TOKEN'] = config.gitlab_token
+        
+        # Pool connections and retry transient failures (rate limiting and
+        # gateway errors) with exponential backoff inside urllib3
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False  # Let raise_for_status() report the final response
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Bind the session's request method once; every API call goes through it
+        self._send = self.session.request
+        
+        # Variables from the last list_variables() call, keyed by variable key
+        # (None for keys defined in several environment scopes), and the
+        # listing itself in API order
+        # None means no listing is cached (never fetched, or invalidated by a write)
+        self._var_cache: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+        self._var_list: Optional[List[Dict[str, Any]]] = None
+        # time.monotonic() when the cached listing was fetched
+        self._var_list_time = 0.0
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    def invalidate_cache(self):
+        """
+        Discard variables cached by list_variables().
+        
+        Called automatically after every create, update or delete so cached
+        lookups never return data older than the last write made by this client.
+        Independently of writes, a cached listing expires after _CACHE_TTL
+        seconds.
+        
+        Example:
+            >>> client.list_variables()
+            >>> client.invalidate_cache()  # Next get_variable() hits the API
+        """
+        self._var_cache = None
+        self._var_list = None
+    
+    def _cache_is_fresh(self) -> bool:
+        """Return True if a listing is cached and younger than _CACHE_TTL seconds."""
+        return (self._var_list is not None
+                and time.monotonic() - self._var_list_time < _CACHE_TTL)
+    
+    def close(self):
+        """
+        Close the underlying HTTP session and release pooled connections.
+        
+        Example:
+            >>> client = GitLabClient(config)
+            >>> client.list_variables()
+            >>> client.close()
+        """
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _make_request(self, method: str, url: str,
+                      allow_status: AbstractSet[int] = frozenset(),
+                      **kwargs) -> requests.Response:
         """
         Make HTTP request to GitLab API.
         
-        Internal method that handles all HTTP requests to the GitLab API. It adds
-        authentication headers and handles errors uniformly.
+        Internal method that handles all HTTP requests to the GitLab API. Requests
+        go through the shared session, which carries the authentication headers
+        and reuses pooled connections. Errors are handled uniformly.
         
         Args:
             method (str): HTTP method (GET, POST, PUT, DELETE)
-            endpoint (str): API endpoint path (e.g., 'projects/123/variables')
+            url (str): Full API URL (e.g., self.variables_url)
+            allow_status (AbstractSet[int]): Error status codes that are expected
+                and returned to the caller instead of raising (e.g., {404})
             **kwargs: Additional arguments to pass to requests.request()
             
         Returns:
@@ -85,23 +224,107 @@ class GitLabClient:
             
         Raises:
             requests.exceptions.HTTPError: If the API returns an error status code
+                not listed in allow_status
             
         Example:
-            >>> response = self._make_request('GET', 'projects/123/variables')
+            >>> response = self._make_request('GET', self.variables_url)
             >>> data = response.json()
         """
-        # Construct the full URL
-        url = f"{self.base_url}/{endpoint}"
+        # Pre-serialize JSON payloads with orjson when available; requests only
+        # sets Content-Type itself for json=, so add it for the raw bytes body
+        if orjson is not None and 'json' in kwargs:
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
+            kwargs['headers'] = _JSON_HEADERS
         
-        # Make the HTTP request with authentication headers
-        response = requests.request(method, url, headers=self.headers, **kwargs)
+        # Make the HTTP request through the shared session (headers already set)
+        response = self._send(method, url, **kwargs)
         
-        # Raise an exception for HTTP error status codes (4xx, 5xx)
-        response.raise_for_status()
+        # Raise an exception for HTTP error status codes (4xx, 5xx), unless the
+        # caller treats the status as an expected outcome (cheaper than raising
+        # and catching HTTPError on common paths such as "variable not found")
+        if response.status_code not in allow_status:
+            response.raise_for_status()
         
         return response
     
-    def list_variables(self) -> List[Dict[str, Any]]:
+    def iter_variables(self, prefetch: int = 2) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all CI/CD variables for the project, one page at a time.
+        
+        Variables are yielded as each page is decoded. Once the first page
+        reports the total page count, the following pages are requested
+        concurrently in a sliding window: while one page is being consumed, at
+        most `prefetch` further pages are in flight or waiting to be consumed,
+        and the next page is only requested as one is taken from the window.
+        Memory therefore stays bounded by the window rather than the whole
+        listing. A caller that stops early avoids requesting the pages beyond
+        the window; requests already in flight still complete.
+        
+        Unlike list_variables(), this does not populate the get_variable() cache.
+        
+        Args:
+            prefetch (int): Maximum number of pages requested ahead of the one
+                being consumed (default: 2)
+        
+        Yields:
+            Dict[str, Any]: Variable dictionaries with the same fields as
+                list_variables()
+        
+        Raises:
+            requests.exceptions.HTTPError: If API request fails
+            
+        Example:
+            >>> for variable in client.iter_variables():
+            ...     if variable['key'] == 'DATABASE_URL':
+            ...         break
+        """
+        per_page = 100  # Maximum allowed by GitLab API (default is 20)
+        
+        def fetch_page(page: int) -> requests.Response:
+            # GET /projects/:id/variables with pagination parameters
+            # Using per_page=100 (max allowed) minimizes the number of API requests needed
+            return self._make_request('GET', self.variables_url,
+                params={'page': page, 'per_page': per_page})
+        
+        # Fetch the first page synchronously to learn how many pages exist
+        response = fetch_page(1)
+        
+        # Check pagination headers to determine if more pages exist
+        # GitLab returns X-Total-Pages header indicating total number of pages
+        total_pages = response.headers.get('X-Total-Pages', '1')
+        
+        # Safely convert to integer
+        try:
+            total_pages = int(total_pages)
+        except (ValueError, TypeError):
+            # If header is missing or invalid, assume only one page
+            total_pages = 1
+        
+        yield from _parse_json(response)
+        
+        # Fetch the remaining pages concurrently over the shared session's
+        # connection pool, keeping at most `window` requests ahead and
+        # consuming the responses in page order
+        if total_pages > 1:
+            pages = iter(range(2, total_pages + 1))
+            window = max(1, min(prefetch, total_pages - 1))
+            with ThreadPoolExecutor(max_workers=window) as executor:
+                pending = collections.deque(
+                    executor.submit(fetch_page, page)
+                    for page in itertools.islice(pages, window))
+                try:
+                    while pending:
+                        page_response = pending.popleft().result()
+                        # Refill the window before handing out this page
+                        for page in itertools.islice(pages, 1):
+                            pending.append(executor.submit(fetch_page, page))
+                        yield from _parse_json(page_response)
+                finally:
+                    # Stopped early (or failed): drop the requests not started yet
+                    for future in pending:
+                        future.cancel()
+    
+    def list_variables(self, use_cache: bool = False) -> List[Dict[str, Any]]:
         """
         List all CI/CD variables for the project.
         
@@ -110,6 +333,15 @@ class GitLabClient:
         
         Note: GitLab API uses pagination (20 items per page by default). This method
         automatically fetches all pages to return the complete list of variables.
+        Use iter_variables() to process variables without building the full list.
+        
+        With use_cache=True, the result of the last list_variables() call is
+        returned without contacting the API, when such a listing is cached (it
+        is discarded by every write made through this client, and expires
+        after _CACHE_TTL seconds).
+        
+        Args:
+            use_cache (bool): Answer from the cached listing when available
         
         Returns:
             List[Dict[str, Any]]: List of variable dictionaries, each containing:
@@ -127,53 +359,43 @@ class GitLabClient:
             >>> variables = client.list_variables()
             >>> print(f"Found {len(variables)} variables")
         """
-        # Initialize pagination variables
-        all_variables = []
-        page = 1
-        per_page = 100  # Maximum allowed by GitLab API (default is 20)
+        if use_cache and self._cache_is_fresh():
+            # Return a new list so callers can't reorder the cached one
+            return list(self._var_list)
         
-        # Loop through all pages to fetch complete list
-        while True:
-            # GET /projects/:id/variables with pagination parameters
-            # Using per_page=100 (max allowed) minimizes the number of API requests needed
-            response = self._make_request('GET', 
-                f'projects/{self.config.project_id}/variables',
-                params={'page': page, 'per_page': per_page})
-            
-            # Extract variables from current page
-            page_variables = response.json()
-            all_variables.extend(page_variables)
-            
-            # Check pagination headers to determine if more pages exist
-            # GitLab returns X-Total-Pages header indicating total number of pages
-            total_pages = response.headers.get('X-Total-Pages', '1')
-            
-            # Safely convert to integer
-            try:
-                total_pages = int(total_pages)
-            except (ValueError, TypeError):
-                # If header is missing or invalid, assume only one page
-                total_pages = 1
-            
-            # Exit loop if we've retrieved all pages
-            if page >= total_pages:
-                break
-            
-            # Increment page number for next iteration
-            page += 1
+        # The whole listing is wanted, so keep more pages in flight at once
+        all_variables = list(self.iter_variables(prefetch=8))
+        
+        # Cache the listing so list_variables()/get_variable(use_cache=True)
+        # can skip the API. A key defined in several environment scopes maps
+        # to None: which of them the API returns is GitLab's decision
+        var_cache = {}
+        for var in all_variables:
+            key = var['key']
+            var_cache[key] = None if key in var_cache else var
+        self._var_cache = var_cache
+        self._var_list = list(all_variables)
+        self._var_list_time = time.monotonic()
         
         # Return complete list of all variables across all pages
         return all_variables
     
-    def get_variable(self, key: str) -> Optional[Dict[str, Any]]:
+    def get_variable(self, key: str, use_cache: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get a specific CI/CD variable by key.
         
         Retrieves detailed information about a single CI/CD variable including its
         value and configuration settings.
         
+        With use_cache=True, the variable is looked up in the result of the last
+        list_variables() call instead of the API, when such a listing is cached
+        (see list_variables()).
+        Keys defined in several environment scopes are still fetched from the
+        API, so the answer is the same as without the cache.
+        
         Args:
             key (str): The variable key/name to retrieve
+            use_cache (bool): Answer from the cached listing when available
             
         Returns:
             Optional[Dict[str, Any]]: Variable dictionary if found, None if not found.
@@ -187,19 +409,24 @@ class GitLabClient:
             >>> if variable:
             ...     print(f"Value: {variable['value']}")
         """
-        try:
-            # GET /projects/:id/variables/:key
-            # URL-encode the key to handle special characters safely
-            encoded_key = quote(key, safe='')
-            response = self._make_request('GET', 
-                f'projects/{self.config.project_id}/variables/{encoded_key}')
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            # Return None if variable doesn't exist (404 Not Found)
-            if e.response.status_code == 404:
+        # The cached listing is complete, so a missing key means "not found"
+        if use_cache and self._cache_is_fresh():
+            if key not in self._var_cache:
                 return None
-            # Re-raise other HTTP errors
-            raise
+            variable = self._var_cache[key]
+            if variable is not None:
+                return variable
+        
+        # GET /projects/:id/variables/:key
+        # URL-encode the key to handle special characters safely
+        encoded_key = _quote_key(key)
+        response = self._make_request('GET', f'{self.variables_url}/{encoded_key}',
+                                      allow_status={404})
+        
+        # Return None if variable doesn't exist (404 Not Found)
+        if response.status_code == 404:
+            return None
+        return _parse_json(response)
     
     def create_variable(self, key: str, value: str, **kwargs) -> Dict[str, Any]:
         """
@@ -221,7 +448,8 @@ class GitLabClient:
             Dict[str, Any]: Created variable dictionary with all its properties
             
         Raises:
-            requests.exceptions.HTTPError: If creation fails (e.g., variable already exists)
+            ConflictError: If a variable with this key already exists
+            requests.exceptions.HTTPError: If creation fails for any other reason
             
         Example:
             >>> var = client.create_variable('API_KEY', 'secret123', protected=True, masked=True)
@@ -235,10 +463,17 @@ class GitLabClient:
         }
         
         # POST /projects/:id/variables
-        response = self._make_request('POST', 
-            f'projects/{self.config.project_id}/variables', 
-            json=data)
-        return response.json()
+        self.invalidate_cache()
+        response = self._make_request('POST', self.variables_url, allow_status={409},
+                                      json=data)
+        
+        # 409 Conflict: a variable with this key already exists
+        if response.status_code == 409:
+            raise ConflictError(
+                f"409 Client Error: {response.reason} for url: {response.url}",
+                response=response
+            )
+        return _parse_json(response)
     
     def update_variable(self, key: str, value: str = None, **kwargs) -> Dict[str, Any]:
         """
@@ -277,12 +512,11 @@ class GitLabClient:
         data.update(kwargs)
         
         # PUT /projects/:id/variables/:key
+        self.invalidate_cache()
         # URL-encode the key to handle special characters safely
-        encoded_key = quote(key, safe='')
-        response = self._make_request('PUT', 
-            f'projects/{self.config.project_id}/variables/{encoded_key}', 
-            json=data)
-        return response.json()
+        encoded_key = _quote_key(key)
+        response = self._make_request('PUT', f'{self.variables_url}/{encoded_key}', json=data)
+        return _parse_json(response)
     
     def delete_variable(self, key: str) -> bool:
         """
@@ -305,17 +539,60 @@ class GitLabClient:
             >>> if success:
             ...     print("Variable deleted")
         """
-        try:
-            # DELETE /projects/:id/variables/:key
-            # URL-encode the key to handle special characters safely
-            encoded_key = quote(key, safe='')
-            self._make_request('DELETE', 
-                f'projects/{self.config.project_id}/variables/{encoded_key}')
-            return True
-        except requests.exceptions.HTTPError as e:
-            # Return False if variable doesn't exist (404 Not Found)
-            if e.response.status_code == 404:
-                return False
-            # Re-raise other HTTP errors
-            raise
-
+        # DELETE /projects/:id/variables/:key
+        self.invalidate_cache()
+        # URL-encode the key to handle special characters safely
+        encoded_key = _quote_key(key)
+        response = self._make_request('DELETE', f'{self.variables_url}/{encoded_key}',
+                                      allow_status={404})
+        
+        # Return False if variable doesn't exist (404 Not Found)
+        return response.status_code != 404
+    
+    def bulk_upsert(self, items: List[Tuple[str, str, Dict[str, Any]]],
+                    max_workers: int = 8) -> List[Tuple[str, Any]]:
+        """
+        Create or update many CI/CD variables concurrently.
+        
+        Each item is first updated in place (PUT); if the variable does not exist
+        yet (404), it is created instead (POST). Requests run on a small thread pool
+        sharing the client's session, so they reuse the same keep-alive connections.
+        A failure on one item does not abort the others.
+        
+        Args:
+            items (List[Tuple[str, str, Dict[str, Any]]]): (key, value, options)
+                tuples, where options are the optional parameters accepted by
+                create_variable()/update_variable() (protected, masked, ...)
+            max_workers (int): Maximum number of concurrent requests (default: 8)
+            
+        Returns:
+            List[Tuple[str, Any]]: (key, result) tuples in input order, where result
+                is the variable dictionary on success or the exception raised for
+                that item
+            
+        Example:
+            >>> results = client.bulk_upsert([
+            ...     ('API_KEY', 'secret123', {'masked': True}),
+            ...     ('DATABASE_URL', 'postgresql://localhost/db', {}),
+            ... ])
+            >>> failed = [key for key, result in results if isinstance(result, Exception)]
+        """
+        def upsert(item: Tuple[str, str, Dict[str, Any]]) -> Tuple[str, Any]:
+            key, value, options = item
+            try:
+                try:
+                    return key, self.update_variable(key, value, **options)
+                except requests.exceptions.HTTPError as e:
+                    # Fall back to creation if the variable doesn't exist yet
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+                    return key, self.create_variable(key, value, **options)
+            except Exception as e:
+                # Record the failure for this item instead of aborting the batch
+                return key, e
+        
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(upsert, items))
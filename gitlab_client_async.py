@@ -0,0 +1,283 @@
+"""
+Asynchronous GitLab API client for managing CI/CD variables (secrets).
+
+This module mirrors the GitLabClient interface from gitlab_client.py using
+aiohttp, so many variable operations can be in flight at once on a single
+event loop. It is intended for highly parallel workloads, such as syncing
+hundreds of variables or managing several projects at the same time.
+
+aiohttp is an optional dependency. Install it with:
+    pip install gitlab-secrets-manager[async]
+
+Example:
+    import asyncio
+    from config import get_config
+    from gitlab_client_async import AsyncGitLabClient
+    
+    async def main():
+        async with AsyncGitLabClient(get_config()) as client:
+            variables = await client.list_variables()
+            await client.bulk_upsert([('API_KEY', 'secret123', {'masked': True})])
+    
+    asyncio.run(main())
+"""
+import asyncio
+import json
+import aiohttp
+from typing import AbstractSet, List, Dict, Optional, Any, Tuple
+from config import Config
+from gitlab_client import VariableConflictError, _JSON_HEADERS, _quote_key, _variables_url, orjson
+
+
+class AsyncConflictError(aiohttp.ClientResponseError, VariableConflictError):
+    """Raised by create_variable() when the variable already exists (HTTP 409)."""
+
+
+class AsyncGitLabClient:
+    """
+    Asynchronous client for interacting with GitLab CI/CD Variables API.
+    
+    Provides the same operations as GitLabClient as coroutines. All requests
+    share one aiohttp session whose connector keeps a bounded pool of
+    keep-alive connections to the GitLab host.
+    
+    Attributes:
+        config (Config): Configuration object containing API credentials
+        base_url (str): Base URL for GitLab API v4 endpoints
+        variables_url (str): Full URL of the project's variables endpoint
+    
+    Example:
+        >>> async with AsyncGitLabClient(config) as client:
+        ...     variables = await client.list_variables()
+    """
+    
+    def __init__(self, config: Config, limit: int = 50):
+        """
+        Initialize the asynchronous GitLab API client.
+        
+        The underlying aiohttp session is created lazily on the first request,
+        since it must belong to a running event loop.
+        
+        Args:
+            config (Config): Configuration object with GitLab credentials and project ID
+            limit (int): Maximum number of simultaneous connections (default: 50)
+        """
+        self.config = config
+        self.base_url = f"{config.gitlab_url}/api/v4"
+        self.variables_url = _variables_url(self.base_url, str(config.project_id))
+        self._limit = limit
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers={'PRIVATE-TOKEN': self.config.gitlab_token},
+                connector=aiohttp.TCPConnector(limit=self._limit, ttl_dns_cache=300)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the underlying aiohttp session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _make_request(self, method: str, url: str,
+                            allow_status: AbstractSet[int] = frozenset(),
+                            **kwargs) -> Tuple[aiohttp.ClientResponse, Any]:
+        """
+        Make HTTP request to GitLab API.
+        
+        Args:
+            method (str): HTTP method (GET, POST, PUT, DELETE)
+            url (str): Full API URL (e.g., self.variables_url)
+            allow_status (AbstractSet[int]): Error status codes that are expected
+                and returned to the caller instead of raising (e.g., {404})
+            **kwargs: Additional arguments to pass to aiohttp's request()
+        
+        Returns:
+            Tuple[aiohttp.ClientResponse, Any]: The response and its decoded JSON
+                body (None for empty bodies and allowed error statuses)
+        
+        Raises:
+            aiohttp.ClientResponseError: If the API returns an error status code
+                not listed in allow_status
+        """
+        # Pre-serialize JSON payloads with orjson when available
+        if orjson is not None and 'json' in kwargs:
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
+            kwargs['headers'] = _JSON_HEADERS
+        
+        async with self._get_session().request(method, url, **kwargs) as response:
+            if response.status in allow_status:
+                return response, None
+            response.raise_for_status()
+            
+            body = await response.read()
+            if not body:
+                return response, None
+            return response, orjson.loads(body) if orjson is not None else json.loads(body)
+    
+    async def list_variables(self) -> List[Dict[str, Any]]:
+        """
+        List all CI/CD variables for the project.
+        
+        Fetches the first page to learn the total page count, then requests all
+        remaining pages concurrently and concatenates them in page order.
+        
+        Returns:
+            List[Dict[str, Any]]: List of variable dictionaries (same fields as
+                GitLabClient.list_variables())
+        
+        Raises:
+            aiohttp.ClientResponseError: If API request fails
+        """
+        per_page = 100  # Maximum allowed by GitLab API (default is 20)
+        
+        async def fetch_page(page: int) -> Tuple[aiohttp.ClientResponse, Any]:
+            # GET /projects/:id/variables with pagination parameters
+            return await self._make_request('GET', self.variables_url,
+                params={'page': page, 'per_page': per_page})
+        
+        response, all_variables = await fetch_page(1)
+        all_variables = all_variables or []
+        
+        # GitLab returns X-Total-Pages header indicating total number of pages
+        try:
+            total_pages = int(response.headers.get('X-Total-Pages', '1'))
+        except (ValueError, TypeError):
+            total_pages = 1
+        
+        if total_pages > 1:
+            pages = await asyncio.gather(*(fetch_page(p) for p in range(2, total_pages + 1)))
+            for _, page_variables in pages:
+                all_variables.extend(page_variables or [])
+        
+        return all_variables
+    
+    async def get_variable(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific CI/CD variable by key.
+        
+        Args:
+            key (str): The variable key/name to retrieve
+        
+        Returns:
+            Optional[Dict[str, Any]]: Variable dictionary if found, None if not found
+        
+        Raises:
+            aiohttp.ClientResponseError: If API request fails (except 404)
+        """
+        response, variable = await self._make_request(
+            'GET', f'{self.variables_url}/{_quote_key(key)}', allow_status={404})
+        return None if response.status == 404 else variable
+    
+    async def create_variable(self, key: str, value: str, **kwargs) -> Dict[str, Any]:
+        """
+        Create a new CI/CD variable.
+        
+        Args:
+            key (str): Variable key/name (required)
+            value (str): Variable value (required)
+            **kwargs: Optional parameters (protected, masked, raw, environment_scope)
+        
+        Returns:
+            Dict[str, Any]: Created variable dictionary with all its properties
+        
+        Raises:
+            AsyncConflictError: If a variable with this key already exists (an
+                aiohttp.ClientResponseError; catch VariableConflictError to
+                handle conflicts from either client)
+            aiohttp.ClientResponseError: If creation fails for any other reason
+        """
+        response, variable = await self._make_request(
+            'POST', self.variables_url, allow_status={409},
+            json={'key': key, 'value': value, **kwargs})
+        
+        # 409 Conflict: a variable with this key already exists
+        if response.status == 409:
+            raise AsyncConflictError(
+                response.request_info, response.history, status=response.status,
+                message=response.reason, headers=response.headers
+            )
+        return variable
+    
+    async def update_variable(self, key: str, value: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        Update an existing CI/CD variable.
+        
+        Args:
+            key (str): Variable key/name to update (required)
+            value (str, optional): New variable value
+            **kwargs: Parameters to update (protected, masked, raw, environment_scope)
+        
+        Returns:
+            Dict[str, Any]: Updated variable dictionary
+        
+        Raises:
+            aiohttp.ClientResponseError: If update fails (e.g., variable not found)
+        """
+        data = {} if value is None else {'value': value}
+        data.update(kwargs)
+        _, variable = await self._make_request(
+            'PUT', f'{self.variables_url}/{_quote_key(key)}', json=data)
+        return variable
+    
+    async def delete_variable(self, key: str) -> bool:
+        """
+        Delete a CI/CD variable.
+        
+        Args:
+            key (str): Variable key/name to delete
+        
+        Returns:
+            bool: True if deletion succeeded, False if variable didn't exist
+        
+        Raises:
+            aiohttp.ClientResponseError: If deletion fails (except 404)
+        """
+        response, _ = await self._make_request(
+            'DELETE', f'{self.variables_url}/{_quote_key(key)}', allow_status={404})
+        return response.status != 404
+    
+    async def bulk_upsert(self, items: List[Tuple[str, str, Dict[str, Any]]],
+                          max_concurrency: int = 50) -> List[Tuple[str, Any]]:
+        """
+        Create or update many CI/CD variables concurrently.
+        
+        Each item is first updated in place (PUT); if the variable does not exist
+        yet (404), it is created instead (POST). A failure on one item does not
+        abort the others.
+        
+        Args:
+            items (List[Tuple[str, str, Dict[str, Any]]]): (key, value, options) tuples
+            max_concurrency (int): Maximum number of in-flight items (default: 50)
+        
+        Returns:
+            List[Tuple[str, Any]]: (key, result) tuples in input order, where result
+                is the variable dictionary on success or the exception raised for
+                that item
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def upsert(key: str, value: str, options: Dict[str, Any]) -> Tuple[str, Any]:
+            async with semaphore:
+                try:
+                    response, variable = await self._make_request(
+                        'PUT', f'{self.variables_url}/{_quote_key(key)}',
+                        allow_status={404}, json={'value': value, **options})
+                    if response.status == 404:
+                        variable = await self.create_variable(key, value, **options)
+                    return key, variable
+                except Exception as e:
+                    # Record the failure for this item instead of aborting the batch
+                    return key, e
+        
+        return list(await asyncio.gather(*(upsert(*item) for item in items)))
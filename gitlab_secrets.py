@@ -19,16 +19,32 @@ Example usage:
     python gitlab_secrets.py download --format json --include-values
 """
 import click
+import functools
+import itertools
 import json
+import operator
+import os
 import re
-import yaml
+import string
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
-from rich import print as rprint
-from config import Config
-from gitlab_client import GitLabClient
+
+# orjson, when installed, parses JSON variables files and encodes JSON
+# downloads several times faster
+# Install with: pip install gitlab-secrets-manager[fast]
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Heavier dependencies (yaml, the GitLab client and its HTTP stack)
+# are imported inside the functions that need them, so that `--help` and
+# commands that don't use them start faster
 
 
 # Initialize Rich console for beautiful terminal output
@@ -43,6 +59,13 @@ console = Console(
 
 
 # Variable key validation
+# Only used to explain why a key was rejected
+_WS_RE = re.compile(r'\s')
+# str.translate() table deleting every allowed character (letters, numbers,
+# underscores), so that translating a key leaves only the offending characters
+_STRIP_ALLOWED_CHARS = dict.fromkeys(map(ord, string.ascii_letters + string.digits + '_'))
+
+
 def validate_variable_key(key: str) -> bool:
     """
     Validate a GitLab variable key according to GitLab's API rules.
@@ -73,49 +96,791 @@ def validate_variable_key(key: str) -> bool:
         >>> validate_variable_key("MY KEY")  # Invalid: contains space
         ValueError: Invalid variable key 'MY KEY'. ...
     """
+    # Fast path for valid keys: two C-level string scans, no per-character
+    # Python work. Underscores are mapped to a letter so that isalnum() accepts
+    # them; isascii() rules out non-ASCII letters and digits that isalnum()
+    # would otherwise allow. Empty keys fail isalnum() and fall through.
+    # GitLab allows: letters, numbers, and underscores
+    # Note: Keys can start with numbers (allowed by GitLab, but not recommended)
+    if key.isascii() and key.replace('_', 'a').isalnum():
+        return True
+    
+    # The key is invalid; work out why to produce a helpful error message
     if not key or not key.strip():
         raise ValueError("Variable key cannot be empty or whitespace only")
     
     # GitLab requires: one line without spaces, letters/numbers/underscores only
     # Check for spaces (including tabs, newlines, etc.)
-    if re.search(r'\s', key):
+    if _WS_RE.search(key):
         raise ValueError(
             f"Invalid variable key '{key}'. "
             "Variable keys must consist of one line without spaces."
         )
     
-    # GitLab allows: letters, numbers, and underscores
-    # Note: Keys can start with numbers (allowed by GitLab, but not recommended)
-    if not re.match(r'^[A-Za-z0-9_]+$', key):
-        invalid_chars = re.findall(r'[^A-Za-z0-9_]', key)
-        if invalid_chars:
-            unique_chars = ', '.join(sorted(set(invalid_chars)))
-            raise ValueError(
-                f"Invalid variable key '{key}'. "
-                f"Key contains invalid characters: {unique_chars}. "
-                "Variable keys can only contain letters, numbers, and underscores."
-            )
-        # Generic error for other cases
-        raise ValueError(
-            f"Invalid variable key '{key}'. "
-            "Variable keys can only contain letters, numbers, and underscores."
-        )
-    
-    return True
+    unique_chars = ', '.join(sorted(set(key.translate(_STRIP_ALLOWED_CHARS))))
+    raise ValueError(
+        f"Invalid variable key '{key}'. "
+        f"Key contains invalid characters: {unique_chars}. "
+        "Variable keys can only contain letters, numbers, and underscores."
+    )
 
 
 # Custom YAML representer for multiline strings
 def multiline_str_presenter(dumper, data):
     """Custom YAML representer for multiline strings using literal block style."""
-    if '\n' in str(data):
+    # Registered for the exact str type, so data is always a str here
+    represent_scalar = dumper.represent_scalar
+    if '\n' in data:
         # Use literal block style for strings with newlines
-        return dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='|')
+        return represent_scalar('tag:yaml.org,2002:str', data, style='|')
     # Use folded block style for very long strings without newlines
-    if len(str(data)) > 120:
-        return dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='>')
-    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data))
+    if len(data) > 120:
+        return represent_scalar('tag:yaml.org,2002:str', data, style='>')
+    return represent_scalar('tag:yaml.org,2002:str', data)
+
+
+# Set once multiline_str_presenter has been registered with PyYAML
+_multiline_presenter_registered = False
+
+
+def _ensure_multiline_presenter():
+    """
+    Register multiline_str_presenter for str on the download dumper, once.
+    
+    Registration mutates PyYAML's class-level representer tables, so it only
+    needs to happen the first time YAML output is produced in this process.
+    Only _yaml_dumper() is changed; the default yaml.Dumper used by other
+    callers of yaml.dump() keeps PyYAML's own str representer.
+    """
+    global _multiline_presenter_registered
+    if _multiline_presenter_registered:
+        return
+    import yaml
+    yaml.add_representer(str, multiline_str_presenter, Dumper=_yaml_dumper())
+    _multiline_presenter_registered = True
+
+
+def _yaml_dumper():
+    """
+    Return the fastest safe YAML dumper class available.
+    
+    libyaml's C emitter (CSafeDumper) is several times faster than the
+    pure-Python one; PyYAML builds without libyaml fall back to SafeDumper.
+    """
+    import yaml
+    return getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+# Text whose first non-blank character is { or [ (matched in place, without
+# copying the text the way lstrip() would)
+_JSON_START_RE = re.compile(r'\s*[\[{]')
+
+
+def _load_yaml_file(file_path: Path) -> Any:
+    """
+    Parse a YAML variables file as fast as possible.
+    
+    Uses libyaml's C loader when PyYAML was built with it, falling back to the
+    pure-Python SafeLoader otherwise. Files whose content starts with '{' or '['
+    are usually plain JSON, so they are parsed with the json module first and
+    only handed to YAML if that fails.
+    
+    Args:
+        file_path (Path): Path to the .yml/.yaml file
+        
+    Returns:
+        Any: The parsed document
+    """
+    import yaml
+    
+    text = file_path.read_text()
+    if _JSON_START_RE.match(text):
+        try:
+            return _json_loads(text)
+        except ValueError:
+            # Flow-style YAML that isn't valid JSON
+            pass
+    
+    return yaml.load(text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+class VariablesFileError(Exception):
+    """Raised when a bulk variables file has an unsupported or invalid format."""
+
+
+def _variables_from_data(data: Any, format_name: str) -> List[Dict[str, Any]]:
+    """
+    Normalize a parsed YAML/JSON document into a list of variable dictionaries.
+    
+    Accepts {'variables': [...]}, a plain {key: value} mapping, or a list of
+    variable dictionaries.
+    """
+    if isinstance(data, dict):
+        if 'variables' in data:
+            # A bare 'variables:' key parses as None
+            return data['variables'] or []
+        # Assume it's a dict of key-value pairs
+        return [{'key': k, 'value': v} for k, v in data.items()]
+    if isinstance(data, list):
+        return data
+    raise VariablesFileError(f"Invalid {format_name} format")
+
+
+def _load_yaml(file_path: Path) -> List[Dict[str, Any]]:
+    """Read variables from a YAML file."""
+    return _variables_from_data(_load_yaml_file(file_path), 'YAML')
+
+
+def _load_json(file_path: Path) -> List[Dict[str, Any]]:
+    """Read variables from a JSON file."""
+    # Read as raw bytes; both orjson and json decode UTF-8 themselves
+    return _variables_from_data(_json_loads(file_path.read_bytes()), 'JSON')
+
+
+def _load_env(file_path: Path) -> List[Dict[str, Any]]:
+    """Read variables from a .env file of key=value lines."""
+    # Read the file in one go and parse key=value lines,
+    # skipping comments and empty lines
+    return [
+        {'key': key.strip(), 'value': value.strip()}
+        for line in file_path.read_text().split('\n')
+        if (stripped := line.strip()) and not stripped.startswith('#') and '=' in stripped
+        for key, value in [stripped.split('=', 1)]
+    ]
+
+
+# Variables file loader for each supported file extension
+_LOADERS = {
+    '.yml': _load_yaml,
+    '.yaml': _load_yaml,
+    '.json': _load_json,
+    '.env': _load_env,
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _load_variables_file(path: str, mtime: float) -> Tuple[Dict[str, Any], ...]:
+    """
+    Load variables from a YAML, JSON or .env file for bulk create/update.
+    
+    The loader is picked by file extension (see _LOADERS); files without a
+    known extension whose name contains 'env' (e.g. 'production.env.local')
+    are read as .env files.
+    
+    Results are cached per (path, modification time), so loading the same
+    unchanged file again in this process (e.g. create then update) is free.
+    The returned tuple and its dictionaries are shared and must not be modified.
+    
+    Args:
+        path (str): Path of the variables file
+        mtime (float): The file's modification time, used as part of the cache key
+        
+    Returns:
+        Tuple[Dict[str, Any], ...]: Variable dictionaries with at least 'key' and 'value'
+        
+    Raises:
+        VariablesFileError: If the file format is unsupported or its content invalid
+    """
+    file_path = Path(path)
+    
+    loader = _LOADERS.get(file_path.suffix) or (_load_env if 'env' in file_path.name else None)
+    if loader is None:
+        raise VariablesFileError("Unsupported file format. Use .yaml, .json, or .env files")
+    
+    return tuple(loader(file_path))
+
+
+# Per-variable settings that a row in a bulk file may set, overriding the
+# defaults given on the command line
+_OVERRIDABLE_FIELDS = ('protected', 'masked', 'raw', 'environment_scope')
+
+# Console line printed for each successful bulk outcome
+_BULK_STATUS_MESSAGES = {
+    'created': "  [green]✓[/green] Created: {key}",
+    'upserted': "  [yellow]🔄[/yellow] Updated: {key} (already exists)",
+    'updated': "  [green]✓[/green] {key}",
+}
+
+
+def _check_variable_row(var) -> Tuple[str, Optional[Exception]]:
+    """
+    Validate the key of a single row from a bulk file.
+    
+    Returns:
+        Tuple[str, Optional[Exception]]: (key, error), where error is None if
+            the row can be sent to the API
+    """
+    var_key = ''
+    try:
+        var_key = var.get('key', '')
+        
+        # Check if key is missing
+        if not var_key:
+            raise ValueError("Missing key in variable entry")
+        
+        validate_variable_key(var_key)
+    except Exception as e:
+        return var_key, e
+    return var_key, None
+
+
+def _apply_variable(client, var, defaults: Dict[str, Any], mode: str,
+                    conflict_error: type) -> Tuple[str, Any]:
+    """
+    Create or update a single, already validated row from a bulk file.
+    
+    The row's own settings (protected, masked, raw, environment_scope) override
+    the command-line defaults. conflict_error is gitlab_client.ConflictError,
+    imported once by the caller rather than for every row.
+    
+    Returns:
+        Tuple[str, Any]: (key, outcome), where outcome is 'created', 'upserted',
+            'updated', or the exception that made the row fail
+    """
+    var_key = var['key']
+    try:
+        get = var.get
+        var_value = get('value', '')
+        # Start from the command-line defaults (built once per run) and let the
+        # row's own settings override them, with one lookup per field
+        kwargs = defaults.copy()
+        for name in _OVERRIDABLE_FIELDS:
+            setting = get(name)
+            if setting is not None:
+                kwargs[name] = setting
+        
+        if mode == 'update':
+            client.update_variable(var_key, var_value, **kwargs)
+            return var_key, 'updated'
+        
+        try:
+            client.create_variable(var_key, var_value, **kwargs)
+            return var_key, 'created'
+        except conflict_error:
+            # If variable already exists and upsert is enabled, try to update
+            if mode != 'upsert':
+                raise
+            client.update_variable(var_key, var_value, **kwargs)
+            return var_key, 'upserted'
+    except Exception as e:
+        return var_key, e
+
+
+def _apply_variables(client, variables, defaults: Dict[str, Any], mode: str):
+    """
+    Create or update variables from a bulk file concurrently.
+    
+    All keys are validated up front in a single pass, so rows with invalid keys
+    are reported without ever being handed to a worker thread. The remaining
+    rows are sent to the API from a small thread pool (the client's session
+    shares keep-alive connections between threads), since bulk operations are
+    dominated by network round trips. Rows for the same key are applied one
+    after another, in file order, by a single worker, so a later row still
+    overrides an earlier one, whatever their environment scopes. A failing
+    row does not stop the others.
+    
+    Args:
+        client (GitLabClient): Client used for the API calls
+        variables: Variable dictionaries, each with at least a 'key'
+        defaults (Dict[str, Any]): Settings applied to rows that don't set them
+        mode (str): 'create', 'upsert' (create, or update if it already exists)
+            or 'update'
+    
+    Yields:
+        Tuple[str, Any]: (key, outcome) for each row, in file order; see
+            _apply_variable()
+    """
+    # Imported lazily, like yaml, to keep them out of CLI startup
+    from concurrent.futures import ThreadPoolExecutor
+    from gitlab_client import ConflictError
+    
+    checked = [_check_variable_row(var) for var in variables]
+    valid = [var for var, (_, error) in zip(variables, checked) if error is None]
+    apply_one = functools.partial(_apply_variable, client, defaults=defaults, mode=mode,
+                                  conflict_error=ConflictError)
+    
+    # Group the rows by key; requests for different keys may land in any
+    # order, but those for the same key must not race. Updates address a
+    # variable by key alone (PUT /variables/<key>), so rows for one key with
+    # different environment scopes still write the same remote variable
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    row_groups = []
+    for var in valid:
+        groups.setdefault(var['key'], []).append(var)
+        row_groups.append(var['key'])
+    
+    def apply_group(rows):
+        return iter([apply_one(var) for var in rows])
+    
+    # Results are taken in file order and consumed (printed) by the calling
+    # thread only, so console output never interleaves
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(groups)))) as executor:
+        applied = {group: executor.submit(apply_group, rows) for group, rows in groups.items()}
+        row_groups = iter(row_groups)
+        for var_key, error in checked:
+            if error is not None:
+                yield var_key, error
+            else:
+                yield next(applied[next(row_groups)].result())
+
+
+# Number of bulk result lines rendered per console.print() call
+_BULK_PRINT_BATCH = 50
+
+
+def _print_bulk_results(results, action: str):
+    """
+    Print the outcome of each bulk row followed by a success/failure summary.
+    
+    Result lines are collected and rendered in batches of _BULK_PRINT_BATCH
+    (without Rich's automatic highlighting), since rendering one console.print()
+    per row dominates the output cost of large imports.
+    
+    Args:
+        results: (key, outcome) tuples as produced by _apply_variables()
+        action (str): Past-tense verb for the summary line (e.g. 'created')
+    """
+    success_count = 0
+    failed_count = 0
+    lines = []
+    
+    for var_key, outcome in results:
+        if isinstance(outcome, Exception):
+            # Keys and error texts are escaped: markup in one of them would
+            # otherwise break the rendering of its whole batch
+            if var_key:
+                lines.append(f"  [red]✗[/red] {escape(str(var_key))}: {escape(str(outcome))}")
+            else:
+                lines.append(f"  [red]✗[/red] {escape(str(outcome))}")
+            failed_count += 1
+        else:
+            lines.append(_BULK_STATUS_MESSAGES[outcome].format(key=escape(var_key)))
+            success_count += 1
+        
+        if len(lines) >= _BULK_PRINT_BATCH:
+            console.print('\n'.join(lines), highlight=False)
+            lines.clear()
+    
+    if lines:
+        console.print('\n'.join(lines), highlight=False)
+    
+    console.print(f"\n[green]Successfully {action}: {success_count}[/green]")
+    if failed_count > 0:
+        console.print(f"[red]Failed: {failed_count}[/red]")
+
+
+# Number of variables from which `list` prints plain tab-separated output
+# instead of a Rich table (rendering a table that large is slow)
+_PLAIN_OUTPUT_THRESHOLD = 1000
+
+# (field, title, default, Rich column options) for each column printed by
+# `list`, in order; the value column is only included with --show-values.
+# This is the only definition of the columns: headers and rows follow it
+_LIST_COLUMNS = (
+    ('key', "Key", '', {'style': "cyan", 'no_wrap': True}),
+    ('value', "Value", '', {'style': "magenta", 'max_width': 50}),
+    ('protected', "Protected", False, {'style': "yellow"}),
+    ('masked', "Masked", False, {'style': "yellow"}),
+    ('raw', "Raw", False, {'style': "yellow"}),
+    ('environment_scope', "Environment Scope", '*', {'style': "green"}),
+)
+_LIST_COLUMNS_WITHOUT_VALUE = _LIST_COLUMNS[:1] + _LIST_COLUMNS[2:]
+
+# Text shown for boolean flags in tables, without calling str() per cell
+_BOOL_STR = {True: 'True', False: 'False'}
+
+
+def _cell_text(value: Any) -> str:
+    """
+    Return the text shown for a field value in a `list` table or TSV line.
+    
+    None (e.g. the value GitLab returns for hidden variables) is shown as an
+    empty cell, the way Rich renders a raw None.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return _BOOL_STR[value]
+    return str(value)
+
+
+# (label, field, default) for each row of the single-variable detail tables
+_DETAIL_PROPS = (
+    ("Key", "key", ""),
+    ("Protected", "protected", False),
+    ("Masked", "masked", False),
+    ("Raw", "raw", False),
+    ("Environment Scope", "environment_scope", "*"),
+)
+
+# Same rows with the variable value shown right after the key (used by `read`)
+_DETAIL_PROPS_WITH_VALUE = _DETAIL_PROPS[:1] + (("Value", "value", ""),) + _DETAIL_PROPS[1:]
+
+
+def _populate_var_table(table, variable: Dict[str, Any], props=_DETAIL_PROPS):
+    """
+    Add one Property/Value row per entry of props to a variable detail table.
+    
+    Args:
+        table: Rich Table with "Property" and "Value" columns
+        variable (Dict[str, Any]): Variable dictionary as returned by the API
+        props: (label, field, default) tuples selecting the rows to show
+    """
+    get = variable.get
+    add_row = table.add_row
+    for label, field, default in props:
+        # Same cell text as `list`: flags as text, a null value as a blank cell
+        add_row(label, _cell_text(get(field, default)))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_filter(pattern: str) -> re.Pattern:
+    """
+    Compile a --filter key pattern (case-insensitive), memoized per pattern.
+    
+    Raises:
+        re.error: If the pattern is not a valid regular expression
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Value used for a sort field that a variable lacks
+_SORT_DEFAULTS = {'key': '', 'protected': False, 'masked': False, 'raw': False}
+
+# Characters with a special meaning in regular expressions; a --filter
+# without any of them is a plain substring
+_REGEX_META = frozenset(r'.^$*+?{}[]\|()')
+
+
+def _filter_and_sort(variables: List[Dict[str, Any]], filter: str, sort: str,
+                     reverse: bool) -> List[Dict[str, Any]]:
+    """
+    Select the variables whose key matches a --filter pattern and sort them.
+    
+    Plain ASCII filters without regex metacharacters (e.g. 'DATABASE_') are
+    matched as case-insensitive substrings with the `in` operator, skipping
+    the regex engine; anything else is searched as a case-insensitive regex.
+    
+    GitLab returns every sortable field, so the sort reads it with a C-level
+    itemgetter; only if some variable lacks the field does it fall back to
+    that field's default value (see _SORT_DEFAULTS).
+    
+    Args:
+        variables (List[Dict[str, Any]]): Variables as returned by the API
+        filter (str): Key pattern, or None/empty to keep every variable
+        sort (str): Field to sort by (e.g. 'key', 'protected')
+        reverse (bool): Sort in descending order
+        
+    Returns:
+        List[Dict[str, Any]]: The matching variables, sorted (stable)
+        
+    Raises:
+        re.error: If the filter is not a valid regular expression
+    """
+    if not filter:
+        selected = list(variables)
+    elif filter.isascii() and _REGEX_META.isdisjoint(filter):
+        # Literal substring: compare lowercased keys with a lowercased needle
+        needle = filter.lower()
+        selected = [var for var in variables if needle in var.get('key', '').lower()]
+    else:
+        # Compile regex pattern for matching (cached per pattern); bind its
+        # search method once rather than looking it up for every variable
+        search = _compile_filter(filter).search
+        selected = [var for var in variables if search(var.get('key', ''))]
+    
+    try:
+        selected.sort(key=operator.itemgetter(sort), reverse=reverse)
+    except KeyError:
+        # Some variable lacks the field (the failed attempt leaves the list
+        # unchanged): sort missing values as the field's default instead
+        default = _SORT_DEFAULTS.get(sort, '')
+        selected.sort(key=lambda var: var.get(sort, default), reverse=reverse)
+    return selected
+
+
+def _load_filtered_sorted(client, filter: str, sort: str,
+                          reverse: bool) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch the project's variables, then filter and sort them for output.
+    
+    This is the shared fetch -> filter -> sort step of the list and download
+    commands. The listing is reused if this process fetched it only moments
+    ago (see GitLabClient.list_variables()). When there is nothing to output, the
+    reason is printed and None is returned so the caller can simply stop.
+    
+    Args:
+        client (GitLabClient): Client used to fetch the variables
+        filter (str): Key pattern, or None/empty to keep every variable
+        sort (str): Field to sort by (e.g. 'key', 'protected')
+        reverse (bool): Sort in descending order
+        
+    Returns:
+        Optional[List[Dict[str, Any]]]: The matching variables, sorted, or
+            None if the project has no variables, the filter is not a valid
+            regex, or no variable matches it
+        
+    Raises:
+        requests.exceptions.RequestException: If the API request fails
+    """
+    variables = client.list_variables(use_cache=True)
+    if not variables:
+        console.print("[yellow]No variables found[/yellow]")
+        return None
+    
+    try:
+        variables = _filter_and_sort(variables, filter, sort, reverse)
+    except re.error as e:
+        console.print(f"[red]Invalid regex pattern: {e}[/red]")
+        return None
+    
+    if filter and not variables:
+        console.print(f"[yellow]No variables match the filter pattern: {filter}[/yellow]")
+        return None
+    return variables
+
+
+# Scalars PyYAML writes unquoted and unchanged: identifier-like words short
+# enough never to be folded (or, as keys, written in explicit "? key" form)
+_YAML_PLAIN_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,119}')
+# Identifier-like words that YAML reads as booleans or null, so PyYAML quotes them
+_YAML_RESERVED_WORDS = frozenset(
+    'yes Yes YES no No NO true True TRUE false False FALSE '
+    'on On ON off Off OFF null Null NULL'.split()
+)
+
+
+def _yaml_needs_quoting(value: Any) -> bool:
+    """
+    Return True unless value is a string PyYAML would write as a bare word.
+    
+    Values for which this returns False can be written verbatim as YAML plain
+    scalars; anything else (punctuation, spaces, numbers, booleans, long or
+    multiline text, non-strings) needs PyYAML's emitter to get quoting,
+    escaping and block styles right.
+    """
+    return (not isinstance(value, str) or _YAML_PLAIN_RE.fullmatch(value) is None
+            or value in _YAML_RESERVED_WORDS)
+
+
+def _strip_document_end(text: str) -> str:
+    """
+    Remove the "..." document-end marker PyYAML appends after some documents.
+    
+    A dump whose last scalar is open-ended (e.g. a keep-chomped "|+" block,
+    used for text ending in a blank line) is closed with "...". That is only
+    valid at the very end of the file, so partial dumps that are followed by
+    more content must drop it; the rest of the text is what a single dump of
+    the whole document would have written at that point.
+    """
+    return text[:-4] if text.endswith('\n...\n') else text
+
+
+def _write_simple_yaml(f, data: Dict[str, Any], Dumper):
+    """
+    Write a flat {key: value} mapping to f as block-style YAML.
+    
+    Produces the same data as yaml.dump(data, Dumper=Dumper,
+    default_flow_style=False, sort_keys=False). Entries whose key and value are
+    plain words (or the value is empty) are formatted directly; only the others
+    go through yaml.dump(), one entry at a time, which lays out each top-level
+    entry exactly as a whole-mapping dump would. The text can differ only in
+    the optional "..." closing the document: libyaml writes it after the last
+    mapping whenever any earlier entry was open-ended, while here only the
+    last entry's own marker is kept (see _strip_document_end()).
+    
+    Args:
+        f: Text file opened for writing
+        data (Dict[str, Any]): Mapping to write, in order
+        Dumper: PyYAML dumper class for the entries that need it
+    """
+    import yaml
+    
+    if not data:
+        # Let PyYAML lay out the empty mapping ("{}")
+        yaml.dump(data, f, Dumper=Dumper, default_flow_style=False, sort_keys=False)
+        return
+    
+    lines = []
+    for key, value in data.items():
+        if _yaml_needs_quoting(key) or (value != '' and _yaml_needs_quoting(value)):
+            lines.append(yaml.dump({key: value}, Dumper=Dumper,
+                                   default_flow_style=False, sort_keys=False))
+        else:
+            lines.append(f"{key}: {value}\n" if value else f"{key}: ''\n")
+    # Only the last entry may close the document with "..."
+    lines[:-1] = map(_strip_document_end, lines[:-1])
+    f.write(''.join(lines))
+
+
+# Number of variables serialized per yaml.dump() call when streaming YAML
+_YAML_CHUNK_SIZE = 100
+
+
+def _without_value(var: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a shallow copy of a variable without its (sensitive) value."""
+    stripped = dict(var)
+    stripped.pop('value', None)
+    return stripped
+
+
+def _looks_like_embedded_json(value: Any) -> bool:
+    """
+    Cheap check for values worth trying to parse as embedded JSON.
+    
+    The value must be a non-empty string whose first non-blank character is
+    { or [ and which contains escaped newlines.
+    """
+    return (isinstance(value, str) and _JSON_START_RE.match(value) is not None
+            and '\\n' in value)
+
 
-yaml.add_representer(str, multiline_str_presenter)
+def _reformat_json_value(value: str) -> str:
+    """
+    Pretty-print an embedded JSON value that uses escaped newlines.
+    
+    The value is parsed and re-encoded with 2-space indentation, still using
+    escaped newlines so the surrounding document stays valid JSON. Values
+    that are not valid JSON are returned unchanged (the same object).
+    """
+    try:
+        # Parse the inner JSON (replace escaped newlines with actual newlines)
+        inner_json = json.loads(value.replace('\\n', '\n'))
+    except ValueError:
+        # Not valid JSON, leave as-is
+        return value
+    
+    # Re-encode with proper indentation and escaped newlines
+    # Format with 2-space indent to match outer structure
+    formatted_inner = json.dumps(inner_json, indent=2, ensure_ascii=False)
+    # Replace actual newlines with escaped newlines for JSON string value
+    return formatted_inner.replace('\n', '\\n')
+
+
+# Total size (in characters) of the embedded JSON values from which they are
+# reformatted in a pool of worker processes. Reformatting runs at roughly
+# 15 MB/s, while starting the pool and shipping the values to it and back
+# costs tens of milliseconds plus ~3 ms/MB, so smaller batches (even
+# thousands of typical values) are faster in this process
+_PARALLEL_JSON_MIN_CHARS = 4 * 1024 * 1024
+
+
+def _format_json_values(variables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the variables with their embedded JSON values pretty-printed.
+    
+    See _reformat_json_value(). Reformatting is CPU-bound, so when the values
+    that qualify add up to at least _PARALLEL_JSON_MIN_CHARS on a multi-core
+    machine it is spread over worker processes (falling back to this process
+    where they are unavailable or fail). Reformatted variables are shallow
+    copies; the input dictionaries are never modified.
+    """
+    positions = [i for i, var in enumerate(variables)
+                 if _looks_like_embedded_json(var.get('value'))]
+    originals = [variables[i]['value'] for i in positions]
+    
+    values = None
+    if ((os.cpu_count() or 1) > 1
+            and sum(map(len, originals)) >= _PARALLEL_JSON_MIN_CHARS):
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            with ProcessPoolExecutor() as executor:
+                values = list(executor.map(_reformat_json_value, originals, chunksize=32))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # No multiprocessing support here (e.g. no /dev/shm in a container),
+            # or a worker died (e.g. a spawned child failed to import this
+            # module): reformat everything in this process instead
+            pass
+    if values is None:
+        values = list(map(_reformat_json_value, originals))
+    
+    formatted = list(variables)
+    for i, original, value in zip(positions, originals, values):
+        if value != original:
+            formatted[i] = dict(variables[i], value=value)
+    return formatted
+
+
+def _json_dumps_indented(obj: Any) -> str:
+    """
+    Encode obj like json.dumps(obj, indent=2, ensure_ascii=False).
+    
+    Uses orjson's native encoder when it is installed (its OPT_INDENT_2 output
+    is identical for the data written here), falling back to the json module
+    for anything orjson refuses (e.g. integers beyond 64 bits).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _write_json_document(f, records, total: int, sort: str):
+    """
+    Stream the JSON download document to f, one variable at a time.
+    
+    Produces the same text as json.dump() of {'variables': [...], 'total': ...,
+    'sorted_by': ...} with indent=2, without building the whole document (or
+    its serialized form) in memory first.
+    
+    Args:
+        f: Text file opened for writing
+        records: Iterable of variable dictionaries to write
+        total (int): Number of variables, for the 'total' field
+        sort (str): Sort field, for the 'sorted_by' field
+    """
+    f.write('{\n  "variables": [')
+    separator = '\n'
+    for record in records:
+        # Nest each record two levels deep, as json.dump(indent=2) would;
+        # serialized strings never contain raw newlines, so splitting is safe
+        encoded = _json_dumps_indented(record)
+        f.write(separator)
+        f.write('    ' + encoded.replace('\n', '\n    '))
+        separator = ',\n'
+    # An empty list is written as [] on one line, like json.dump
+    f.write('\n  ],\n' if separator != '\n' else '],\n')
+    f.write(f'  "total": {json.dumps(total)},\n')
+    f.write(f'  "sorted_by": {json.dumps(sort, ensure_ascii=False)}\n}}')
+
+
+def _write_yaml_document(f, records, total: int, sort: str, Dumper):
+    """
+    Stream the structured YAML download document to f in chunks of variables.
+    
+    Produces the same data as a single yaml.dump() of {'variables': [...],
+    'total': ..., 'sorted_by': ...}: block sequences under a mapping key are
+    not indented, so consecutive dumps of sub-lists concatenate into one list
+    once their document-end markers are dropped (see _strip_document_end()).
+    With the libyaml dumper the text can differ from a single dump only in
+    the optional "..." after the last line.
+    
+    Args:
+        f: Text file opened for writing
+        records: Iterable of variable dictionaries to write
+        total (int): Number of variables, for the 'total' field
+        sort (str): Sort field, for the 'sorted_by' field
+        Dumper: PyYAML dumper class to emit with
+    """
+    import yaml
+    
+    options = dict(Dumper=Dumper, default_flow_style=False, sort_keys=False, indent=2)
+    records = iter(records)
+    chunk = list(itertools.islice(records, _YAML_CHUNK_SIZE))
+    if not chunk:
+        # Let PyYAML lay out the empty list ("variables: []")
+        yaml.dump({'variables': chunk}, f, **options)
+    else:
+        f.write('variables:\n')
+        while chunk:
+            # More chunks or the totals follow, so the chunk must not end
+            # the document
+            f.write(_strip_document_end(yaml.dump(chunk, **options)))
+            chunk = list(itertools.islice(records, _YAML_CHUNK_SIZE))
+    yaml.dump({'total': total, 'sorted_by': sort}, f, **options)
 
 
 @click.group()
@@ -133,17 +898,63 @@ def cli(ctx):
     
     These can be set as environment variables or in a .env file.
     """
-    # Load and validate configuration
-    config = Config()
-    try:
-        # Ensure required credentials are present
-        config.validate()
+    # Only set up the shared state here; configuration is validated and the
+    # client created by _get_client() once a command actually runs, so that
+    # `<command> --help` needs neither credentials nor the HTTP stack
+    ctx.ensure_object(dict)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_context(config):
+    """
+    Validate the configuration and create its GitLab client (memoized).
+    
+    Keyed on the configuration's values (GitLab URL, token and project ID), so
+    repeated in-process invocations of the CLI (tests, scripts driving it
+    through Click) with the same settings reuse the same client and its HTTP
+    session setup, while changed settings get a new client. A failed
+    validation raises and is not cached.
+    
+    Args:
+        config (Config): Configuration from get_config()
+    
+    Returns:
+        Tuple[Config, GitLabClient]: The validated configuration and its client
         
-        # Set up Click context for passing data between commands
-        ctx.ensure_object(dict)
-        ctx.obj['config'] = config
-        ctx.obj['client'] = GitLabClient(config)
+    Raises:
+        ValueError: If required configuration is missing
+    """
+    from gitlab_client import GitLabClient
+    
+    # Ensure required credentials are present
+    config.validate()
+    return config, GitLabClient(config)
+
+
+def _get_client(ctx):
+    """
+    Return the GitLab client shared by all commands, creating it on first use.
+    
+    Stores the configuration and client from _build_context() in the root
+    context object and releases the client's pooled connections when the CLI
+    exits. Aborts the command with setup instructions if required settings are
+    missing.
+    
+    Args:
+        ctx (click.Context): Context of the running command
         
+    Returns:
+        GitLabClient: The shared, configured client
+    """
+    obj = ctx.find_root().ensure_object(dict)
+    if 'client' in obj:
+        return obj['client']
+    
+    from config import get_config
+    
+    try:
+        # Load the configuration for the current settings and validate it
+        config, client = _build_context(get_config())
     except ValueError as e:
         # Display helpful error message if configuration is missing
         console.print(f"[red]Error: {e}[/red]")
@@ -154,6 +965,14 @@ def cli(ctx):
         
         # Abort CLI execution
         ctx.abort()
+    
+    obj['config'] = config
+    obj['client'] = client
+    
+    # Release pooled HTTP connections once the CLI finishes; the session itself
+    # stays usable and reconnects if the client is reused
+    ctx.find_root().call_on_close(client.close)
+    return client
 
 
 @cli.command()
@@ -194,151 +1013,42 @@ def create(ctx, key: str, value: str, protected: bool, masked: bool, raw: bool,
         # Bulk upsert: create or update existing variables
         python gitlab_secrets.py create --file variables.json --upsert
     """
+    from gitlab_client import ConflictError
+    
     # Get the GitLab client from context
-    client = ctx.obj['client']
+    client = _get_client(ctx)
     
     try:
         # Bulk create from file
         if file:
             file_path = Path(file)
             
-            # Read file based on extension
-            if file_path.suffix in ['.yml', '.yaml']:
-                # Read YAML file
-                with open(file_path, 'r') as f:
-                    data = yaml.safe_load(f)
-                
-                # Handle different YAML structures
-                if isinstance(data, dict):
-                    if 'variables' in data:
-                        variables = data['variables']
-                    else:
-                        # Assume it's a dict of key-value pairs
-                        variables = [{'key': k, 'value': v} for k, v in data.items()]
-                elif isinstance(data, list):
-                    variables = data
-                else:
-                    console.print("[red]Invalid YAML format[/red]")
-                    return
-                    
-            elif file_path.suffix == '.json':
-                # Read JSON file
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Handle different JSON structures
-                if isinstance(data, dict):
-                    if 'variables' in data:
-                        variables = data['variables']
-                    else:
-                        # Assume it's a dict of key-value pairs
-                        variables = [{'key': k, 'value': v} for k, v in data.items()]
-                elif isinstance(data, list):
-                    variables = data
-                else:
-                    console.print("[red]Invalid JSON format[/red]")
-                    return
-                
-            elif file_path.suffix == '.env' or 'env' in file_path.name:
-                # Read .env file
-                variables = []
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip comments and empty lines
-                        if not line or line.startswith('#'):
-                            continue
-                        # Parse key=value
-                        if '=' in line:
-                            key, value = line.split('=', 1)
-                            variables.append({'key': key.strip(), 'value': value.strip()})
-            else:
-                console.print("[red]Unsupported file format. Use .yaml, .json, or .env files[/red]")
+            # Parse the file (cached per path and modification time)
+            try:
+                variables = _load_variables_file(str(file_path), file_path.stat().st_mtime)
+            except VariablesFileError as e:
+                console.print(f"[red]{e}[/red]")
                 return
             
             if not variables:
                 console.print("[yellow]No variables found in file[/yellow]")
                 return
             
+            # Options from the command line apply to every row unless the row sets them
+            defaults = {}
+            if protected:
+                defaults['protected'] = True
+            if masked:
+                defaults['masked'] = True
+            if raw:
+                defaults['raw'] = True
+            if environment_scope and environment_scope != '*':
+                defaults['environment_scope'] = environment_scope
+            
             # Create all variables
             console.print(f"[cyan]Creating {len(variables)} variables...[/cyan]")
-            success_count = 0
-            failed_count = 0
-            
-            for var in variables:
-                try:
-                    var_key = var.get('key', '')
-                    var_value = var.get('value', '')
-                    
-                    # Check if key is missing
-                    if not var_key:
-                        console.print(f"  [red]✗[/red] Missing key in variable entry")
-                        failed_count += 1
-                        continue
-                    
-                    # Validate variable key
-                    try:
-                        validate_variable_key(var_key)
-                    except ValueError as e:
-                        console.print(f"  [red]✗[/red] {var_key}: {e}")
-                        failed_count += 1
-                        continue
-                    
-                    # Build kwargs from variable data or use defaults
-                    kwargs = {}
-                    if var.get('protected') is not None:
-                        kwargs['protected'] = var['protected']
-                    elif protected:
-                        kwargs['protected'] = True
-                        
-                    if var.get('masked') is not None:
-                        kwargs['masked'] = var['masked']
-                    elif masked:
-                        kwargs['masked'] = True
-                        
-                    if var.get('raw') is not None:
-                        kwargs['raw'] = var['raw']
-                    elif raw:
-                        kwargs['raw'] = True
-                    
-                    # Handle environment_scope
-                    if var.get('environment_scope') is not None:
-                        kwargs['environment_scope'] = var['environment_scope']
-                    elif environment_scope and environment_scope != '*':
-                        kwargs['environment_scope'] = environment_scope
-                    
-                    # Try to create the variable
-                    try:
-                        client.create_variable(var_key, var_value, **kwargs)
-                        console.print(f"  [green]✓[/green] Created: {var_key}")
-                        success_count += 1
-                    except Exception as create_error:
-                        # If variable already exists and upsert is enabled, try to update
-                        # Check if it's an HTTPError with status code 409 (Conflict)
-                        is_conflict = False
-                        if hasattr(create_error, 'response'):
-                            is_conflict = create_error.response.status_code == 409
-                        else:
-                            # Fallback to string matching for other exception types
-                            is_conflict = '409' in str(create_error) or 'Conflict' in str(create_error)
-                        
-                        if upsert and is_conflict:
-                            try:
-                                client.update_variable(var_key, var_value, **kwargs)
-                                console.print(f"  [yellow]🔄[/yellow] Updated: {var_key} (already exists)")
-                                success_count += 1
-                            except Exception as update_error:
-                                console.print(f"  [red]✗[/red] {var_key}: {update_error}")
-                                failed_count += 1
-                        else:
-                            raise create_error
-                except Exception as e:
-                    console.print(f"  [red]✗[/red] {var_key}: {e}")
-                    failed_count += 1
-            
-            console.print(f"\n[green]Successfully created: {success_count}[/green]")
-            if failed_count > 0:
-                console.print(f"[red]Failed: {failed_count}[/red]")
+            mode = 'upsert' if upsert else 'create'
+            _print_bulk_results(_apply_variables(client, variables, defaults, mode), 'created')
             
             return
         
@@ -380,33 +1090,20 @@ def create(ctx, key: str, value: str, protected: bool, masked: bool, raw: bool,
             # Try to create the variable
             variable = client.create_variable(key, value, **kwargs)
             console.print(f"[green]✓[/green] Successfully created variable: [bold]{key}[/bold]")
-        except Exception as create_error:
+        except ConflictError:
             # If variable already exists and upsert is enabled, try to update
-            # Check if it's an HTTPError with status code 409 (Conflict)
-            is_conflict = False
-            if hasattr(create_error, 'response'):
-                is_conflict = create_error.response.status_code == 409
-            else:
-                # Fallback to string matching for other exception types
-                is_conflict = '409' in str(create_error) or 'Conflict' in str(create_error)
-            
-            if upsert and is_conflict:
-                variable = client.update_variable(key, value, **kwargs)
-                is_updated = True
-                console.print(f"[yellow]🔄[/yellow] Successfully updated variable: [bold]{key}[/bold] (already exists)")
-            else:
-                raise create_error
+            if not upsert:
+                raise
+            variable = client.update_variable(key, value, **kwargs)
+            is_updated = True
+            console.print(f"[yellow]🔄[/yellow] Successfully updated variable: [bold]{key}[/bold] (already exists)")
         
         # Display variable details in a formatted table
         table = Table(title="Variable Details")
         table.add_column("Property", style="cyan")
         table.add_column("Value", style="magenta")
         
-        table.add_row("Key", variable.get('key', ''))
-        table.add_row("Protected", str(variable.get('protected', False)))
-        table.add_row("Masked", str(variable.get('masked', False)))
-        table.add_row("Raw", str(variable.get('raw', False)))
-        table.add_row("Environment Scope", variable.get('environment_scope', '*'))
+        _populate_var_table(table, variable)
         
         console.print(table)
         
@@ -433,7 +1130,7 @@ def read(ctx, key: str):
         python gitlab_secrets.py read API_KEY
     """
     # Get the GitLab client from context
-    client = ctx.obj['client']
+    client = _get_client(ctx)
     
     # Validate variable key
     try:
@@ -457,12 +1154,7 @@ def read(ctx, key: str):
         table.add_column("Value", style="magenta")
         
         # Add all variable properties to the table
-        table.add_row("Key", variable.get('key', ''))
-        table.add_row("Value", variable.get('value', ''))
-        table.add_row("Protected", str(variable.get('protected', False)))
-        table.add_row("Masked", str(variable.get('masked', False)))
-        table.add_row("Raw", str(variable.get('raw', False)))
-        table.add_row("Environment Scope", variable.get('environment_scope', '*'))
+        _populate_var_table(table, variable, _DETAIL_PROPS_WITH_VALUE)
         
         console.print(table)
         
@@ -502,128 +1194,38 @@ def update(ctx, key: str, value: str, protected: bool, masked: bool, raw: bool,
         python gitlab_secrets.py update --file .env.updates
     """
     # Get the GitLab client from context
-    client = ctx.obj['client']
+    client = _get_client(ctx)
     
     try:
         # Bulk update from file
         if file:
             file_path = Path(file)
             
-            # Read file based on extension
-            if file_path.suffix in ['.yml', '.yaml']:
-                # Read YAML file
-                with open(file_path, 'r') as f:
-                    data = yaml.safe_load(f)
-                
-                # Handle different YAML structures
-                if isinstance(data, dict):
-                    if 'variables' in data:
-                        variables = data['variables']
-                    else:
-                        # Assume it's a dict of key-value pairs
-                        variables = [{'key': k, 'value': v} for k, v in data.items()]
-                elif isinstance(data, list):
-                    variables = data
-                else:
-                    console.print("[red]Invalid YAML format[/red]")
-                    return
-                    
-            elif file_path.suffix == '.json':
-                # Read JSON file
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Handle different JSON structures
-                if isinstance(data, dict):
-                    if 'variables' in data:
-                        variables = data['variables']
-                    else:
-                        # Assume it's a dict of key-value pairs
-                        variables = [{'key': k, 'value': v} for k, v in data.items()]
-                elif isinstance(data, list):
-                    variables = data
-                else:
-                    console.print("[red]Invalid JSON format[/red]")
-                    return
-                
-            elif file_path.suffix == '.env' or 'env' in file_path.name:
-                # Read .env file
-                variables = []
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip comments and empty lines
-                        if not line or line.startswith('#'):
-                            continue
-                        # Parse key=value
-                        if '=' in line:
-                            key, value = line.split('=', 1)
-                            variables.append({'key': key.strip(), 'value': value.strip()})
-            else:
-                console.print("[red]Unsupported file format. Use .yaml, .json, or .env files[/red]")
+            # Parse the file (cached per path and modification time)
+            try:
+                variables = _load_variables_file(str(file_path), file_path.stat().st_mtime)
+            except VariablesFileError as e:
+                console.print(f"[red]{e}[/red]")
                 return
             
             if not variables:
                 console.print("[yellow]No variables found in file[/yellow]")
                 return
             
+            # Options from the command line apply to every row unless the row sets them
+            defaults = {}
+            if protected is not None:
+                defaults['protected'] = protected
+            if masked is not None:
+                defaults['masked'] = masked
+            if raw is not None:
+                defaults['raw'] = raw
+            if environment_scope:
+                defaults['environment_scope'] = environment_scope
+            
             # Update all variables
             console.print(f"[cyan]Updating {len(variables)} variables...[/cyan]")
-            success_count = 0
-            failed_count = 0
-            
-            for var in variables:
-                try:
-                    var_key = var.get('key', '')
-                    var_value = var.get('value', '')
-                    
-                    # Check if key is missing
-                    if not var_key:
-                        console.print(f"  [red]✗[/red] Missing key in variable entry")
-                        failed_count += 1
-                        continue
-                    
-                    # Validate variable key
-                    try:
-                        validate_variable_key(var_key)
-                    except ValueError as e:
-                        console.print(f"  [red]✗[/red] {var_key}: {e}")
-                        failed_count += 1
-                        continue
-                    
-                    # Build kwargs from variable data or use defaults
-                    kwargs = {}
-                    if var.get('protected') is not None:
-                        kwargs['protected'] = var['protected']
-                    elif protected is not None:
-                        kwargs['protected'] = protected
-                        
-                    if var.get('masked') is not None:
-                        kwargs['masked'] = var['masked']
-                    elif masked is not None:
-                        kwargs['masked'] = masked
-                        
-                    if var.get('raw') is not None:
-                        kwargs['raw'] = var['raw']
-                    elif raw is not None:
-                        kwargs['raw'] = raw
-                    
-                    # Handle environment_scope
-                    if var.get('environment_scope') is not None:
-                        kwargs['environment_scope'] = var['environment_scope']
-                    elif environment_scope:
-                        kwargs['environment_scope'] = environment_scope
-                    
-                    client.update_variable(var_key, var_value, **kwargs)
-                    console.print(f"  [green]✓[/green] {var_key}")
-                    success_count += 1
-                except Exception as e:
-                    console.print(f"  [red]✗[/red] {var_key}: {e}")
-                    failed_count += 1
-            
-            console.print(f"\n[green]Successfully updated: {success_count}[/green]")
-            if failed_count > 0:
-                console.print(f"[red]Failed: {failed_count}[/red]")
+            _print_bulk_results(_apply_variables(client, variables, defaults, 'update'), 'updated')
             
             return
         
@@ -664,11 +1266,7 @@ def update(ctx, key: str, value: str, protected: bool, masked: bool, raw: bool,
         table.add_column("Property", style="cyan")
         table.add_column("Value", style="magenta")
         
-        table.add_row("Key", variable.get('key', ''))
-        table.add_row("Protected", str(variable.get('protected', False)))
-        table.add_row("Masked", str(variable.get('masked', False)))
-        table.add_row("Raw", str(variable.get('raw', False)))
-        table.add_row("Environment Scope", variable.get('environment_scope', '*'))
+        _populate_var_table(table, variable)
         
         console.print(table)
         
@@ -695,7 +1293,7 @@ def delete(ctx, key: str):
         python gitlab_secrets.py delete OLD_API_KEY
     """
     # Get the GitLab client from context
-    client = ctx.obj['client']
+    client = _get_client(ctx)
     
     # Validate variable key
     try:
@@ -726,8 +1324,12 @@ def delete(ctx, key: str):
 @click.option('--show-values', is_flag=True, default=False, 
               help='Display variable values (use with caution for sensitive data)')
 @click.option('--filter', '-f', help='Filter variables by key pattern (regex supported)')
+@click.option('--plain/--no-plain', default=None,
+              help='Print tab-separated values instead of a table '
+                   '(default: automatic for 1000+ variables)')
 @click.pass_context
-def list_variables(ctx, sort: str, reverse: bool, show_values: bool, filter: str):
+def list_variables(ctx, sort: str, reverse: bool, show_values: bool, filter: str,
+                   plain: Optional[bool]):
     """
     List all GitLab secrets (CI/CD variables).
     
@@ -739,95 +1341,92 @@ def list_variables(ctx, sort: str, reverse: bool, show_values: bool, filter: str
     
     By default, values are hidden for security. Use --show-values to display them.
     
+    Use --plain for tab-separated output (one header line, then one line per
+    variable) that is quick to print and easy to pipe into other tools. It is
+    used automatically for 1000 or more variables; pass --no-plain to keep the
+    table in that case.
+    
     Example:
         python gitlab_secrets.py list
         python gitlab_secrets.py list --sort protected --reverse
         python gitlab_secrets.py list --sort masked --show-values
         python gitlab_secrets.py list --filter "API.*"
         python gitlab_secrets.py list --filter "DATABASE_" --show-values
+        python gitlab_secrets.py list --plain | cut -f1
+        python gitlab_secrets.py list --no-plain
     """
     # Get the GitLab client from context
-    client = ctx.obj['client']
+    client = _get_client(ctx)
     
     try:
-        # Fetch all variables from GitLab
-        variables = client.list_variables()
-        
-        # Check if any variables exist
-        if not variables:
-            console.print("[yellow]No variables found[/yellow]")
+        # Fetch all variables from GitLab, apply the filter if provided and
+        # sort them by the specified field
+        variables = _load_filtered_sorted(client, filter, sort, reverse)
+        if variables is None:
             return
         
-        # Apply filter if provided
-        if filter:
-            try:
-                # Compile regex pattern for matching
-                pattern = re.compile(filter, re.IGNORECASE)
-                # Filter variables by key name
-                variables = [var for var in variables if pattern.search(var.get('key', ''))]
-                
-                if not variables:
-                    console.print(f"[yellow]No variables match the filter pattern: {filter}[/yellow]")
-                    return
-                
-                console.print(f"[dim]Filtered by pattern: {filter}[/dim]")
-            except re.error as e:
-                console.print(f"[red]Invalid regex pattern: {e}[/red]")
-                return
+        # Unless --plain/--no-plain was given, large result sets skip Rich's
+        # table layout entirely
+        if plain is None:
+            plain = len(variables) >= _PLAIN_OUTPUT_THRESHOLD
         
-        # Sort variables by the specified field
-        # Lambda function extracts the sort field from each variable dict
-        variables.sort(key=lambda x: x.get(sort, ''), reverse=reverse)
+        if filter and not plain:
+            console.print(f"[dim]Filtered by pattern: {filter}[/dim]")
         
-        # Create a formatted table to display variables
-        table = Table(title=f"GitLab CI/CD Variables (sorted by {sort})")
-        table.add_column("Key", style="cyan", no_wrap=True)
-        
-        # Add Value column if --show-values flag is set
-        if show_values:
-            table.add_column("Value", style="magenta", max_width=50)
+        # Columns to print; every row is built from the same definitions
+        columns = _LIST_COLUMNS if show_values else _LIST_COLUMNS_WITHOUT_VALUE
+        fields = [(field, default) for field, _, default, _ in columns]
         
-        table.add_column("Protected", style="yellow")
-        table.add_column("Masked", style="yellow")
-        table.add_column("Raw", style="yellow")
-        table.add_column("Environment Scope", style="green")
+        # Build every row up front, then output them in one tight loop
+        rows = [[_cell_text(var.get(field, default)) for field, default in fields]
+                for var in variables]
         
-        # Add each variable as a row in the table
-        for var in variables:
-            row_data = [var.get('key', '')]
-            
-            # Add value if requested
-            if show_values:
-                row_data.append(var.get('value', ''))
+        if plain:
+            import csv
+            import sys
             
-            # Add other properties
-            row_data.extend([
-                str(var.get('protected', False)),
-                str(var.get('masked', False)),
-                str(var.get('raw', False)),
-                var.get('environment_scope', '*')
-            ])
+            # Tab-separated values straight to stdout: a header, then the rows
+            writer = csv.writer(sys.stdout, dialect='excel-tab', lineterminator='\n')
+            writer.writerow([field for field, _ in fields])
+            writer.writerows(rows)
             
-            table.add_row(*row_data)
+            # Keep stdout machine-readable; warnings go to stderr
+            if show_values:
+                click.echo("Warning: Sensitive values are being displayed", err=True)
+            return
+        
+        # Create a formatted table to display variables
+        table = Table(title=f"GitLab CI/CD Variables (sorted by {sort})")
+        for _, title, _, options in columns:
+            table.add_column(title, **options)
+        
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
         
         # Display the table
         # Rich will render all rows - output may be long in Docker, but all data is there
         console.print(table)
         
+        # Collect the trailing summary and warnings and print them in one call
         # Show total count with note about display
         total_count = len(variables)
-        console.print(f"\n[dim]Total: {total_count} variables[/dim]")
+        trailer = [f"\n[dim]Total: {total_count} variables[/dim]"]
         
         # Warn if table might be truncated in terminal output
         if total_count > 50:
-            console.print(f"[yellow]Note: Showing all {total_count} variables above. If you can't see them all, try:[/yellow]")
-            console.print(f"[dim]  - Scroll up in your terminal/Docker output[/dim]")
-            console.print(f"[dim]  - Use 'gitlab-secrets download' to export to a file[/dim]")
-            console.print(f"[dim]  - Use '--filter' option to narrow results[/dim]")
+            trailer += [
+                f"[yellow]Note: Showing all {total_count} variables above. If you can't see them all, try:[/yellow]",
+                "[dim]  - Scroll up in your terminal/Docker output[/dim]",
+                "[dim]  - Use 'gitlab-secrets download' to export to a file[/dim]",
+                "[dim]  - Use '--filter' option to narrow results[/dim]",
+            ]
         
         # Warn if values are being displayed
         if show_values:
-            console.print("[yellow]⚠ Warning: Sensitive values are being displayed[/yellow]")
+            trailer.append("[yellow]⚠ Warning: Sensitive values are being displayed[/yellow]")
+        
+        console.print('\n'.join(trailer))
         
     except Exception as e:
         # Display error message if listing fails
@@ -869,36 +1468,17 @@ def download(ctx, output: str, format: str, sort: str, reverse: bool, include_va
         python gitlab_secrets.py download --format json --output backup.json  # Override format
     """
     # Get the GitLab client from context
-    client = ctx.obj['client']
+    client = _get_client(ctx)
     
     try:
-        # Fetch all variables from GitLab
-        variables = client.list_variables()
-        
-        # Check if any variables exist
-        if not variables:
-            console.print("[yellow]No variables found[/yellow]")
+        # Fetch all variables from GitLab, apply the filter if provided and
+        # sort them by the specified field
+        variables = _load_filtered_sorted(client, filter, sort, reverse)
+        if variables is None:
             return
         
-        # Apply filter if provided
         if filter:
-            try:
-                # Compile regex pattern for matching
-                pattern = re.compile(filter, re.IGNORECASE)
-                # Filter variables by key name
-                variables = [var for var in variables if pattern.search(var.get('key', ''))]
-                
-                if not variables:
-                    console.print(f"[yellow]No variables match the filter pattern: {filter}[/yellow]")
-                    return
-                
-                console.print(f"[dim]Filtered by pattern: {filter}[/dim]")
-            except re.error as e:
-                console.print(f"[red]Invalid regex pattern: {e}[/red]")
-                return
-        
-        # Sort variables by the specified field
-        variables.sort(key=lambda x: x.get(sort, ''), reverse=reverse)
+            console.print(f"[dim]Filtered by pattern: {filter}[/dim]")
         
         # Determine output file path if not provided
         if not output:
@@ -922,6 +1502,8 @@ def download(ctx, output: str, format: str, sort: str, reverse: bool, include_va
         
         # Write to file based on format
         if format == 'yaml':
+            _ensure_multiline_presenter()
+            
             # YAML format: human-readable structured data
             # Use the yaml_format parameter (simple or structured)
             # Default to simple if no format specified
@@ -942,114 +1524,67 @@ def download(ctx, output: str, format: str, sort: str, reverse: bool, include_va
                     f.write("# GitLab CI/CD Variables\n")
                     f.write(f"# Total: {len(variables)}\n")
                     f.write(f"# Sorted by: {sort}\n\n")
-                    yaml.dump(simple_data, f, default_flow_style=False, sort_keys=False)
+                    _write_simple_yaml(f, simple_data, _yaml_dumper())
                 
             else:
                 # Structured format with metadata
                 if include_values:
                     # Include all data including sensitive values
-                    data = {
-                        'variables': variables,
-                        'total': len(variables),
-                        'sorted_by': sort
-                    }
+                    records = variables
                 else:
                     # Exclude values for security (only show metadata)
-                    data = {
-                        'variables': [
-                            {k: v for k, v in var.items() if k != 'value'} 
-                            for var in variables
-                        ],
-                        'total': len(variables),
-                        'sorted_by': sort
-                    }
+                    records = map(_without_value, variables)
                 
-                # Write structured YAML to file with indentation for readability
+                # Stream structured YAML to file with indentation for readability
                 with open(output_path, 'w') as f:
-                    yaml.dump(data, f, default_flow_style=False, sort_keys=False, indent=2)
+                    _write_yaml_document(f, records, len(variables), sort, _yaml_dumper())
             
             console.print(f"[green]✓[/green] Downloaded {len(variables)} variables to [bold]{output_path}[/bold]")
             
         elif format == 'json':
             # JSON format: structured data with metadata
             if include_values:
-                # Include all data including sensitive values
-                data = {
-                    'variables': variables,
-                    'total': len(variables),
-                    'sorted_by': sort
-                }
+                # Include all data including sensitive values, formatting
+                # multiline JSON values nicely (still as escaped newlines
+                # for valid JSON)
+                records = _format_json_values(variables)
             else:
                 # Exclude values for security (only show metadata)
-                data = {
-                    'variables': [
-                        {k: v for k, v in var.items() if k != 'value'} 
-                        for var in variables
-                    ],
-                    'total': len(variables),
-                    'sorted_by': sort
-                }
+                records = map(_without_value, variables)
             
-            # Write standard JSON format (valid JSON with escaped newlines)
+            # Stream standard JSON (with escaped newlines in string values)
             with open(output_path, 'w', encoding='utf-8') as f:
-                # Process data to format multiline JSON values nicely (still as escaped newlines for valid JSON)
-                formatted_data = json.loads(json.dumps(data))  # Deep copy to avoid modifying original
-                
-                if include_values and 'variables' in formatted_data:
-                    for var in formatted_data['variables']:
-                        if 'value' in var and var['value'] and isinstance(var['value'], str):
-                            value = var['value']
-                            # If value contains escaped newlines and looks like JSON (starts with { or [)
-                            # parse and format with proper indentation (outputs as escaped newlines for valid JSON)
-                            if '\\n' in value:
-                                stripped = value.strip()
-                                if stripped.startswith('{') or stripped.startswith('['):
-                                    try:
-                                        # Parse the inner JSON (replace escaped newlines with actual newlines)
-                                        inner_json_str = value.replace('\\n', '\n')
-                                        inner_json = json.loads(inner_json_str)
-                                        # Re-encode with proper indentation and escaped newlines
-                                        # Format with 2-space indent to match outer structure
-                                        formatted_inner = json.dumps(inner_json, indent=2, ensure_ascii=False)
-                                        # Replace actual newlines with escaped newlines for JSON string value
-                                        var['value'] = formatted_inner.replace('\n', '\\n')
-                                    except (json.JSONDecodeError, ValueError):
-                                        # Not valid JSON, leave as-is
-                                        pass
-                
-                # Write standard JSON (with escaped newlines in string values)
-                json.dump(formatted_data, f, indent=2, ensure_ascii=False)
+                _write_json_document(f, records, len(variables), sort)
             
             console.print(f"[green]✓[/green] Downloaded {len(variables)} variables to [bold]{output_path}[/bold]")
             
         elif format == 'env':
             # .env format: key=value pairs (like .env files)
+            # Header comments
+            lines = [f"# GitLab CI/CD Variables\n# Total: {len(variables)}\n# Sorted by: {sort}\n\n"]
+            
+            # Each variable as key=value
+            if include_values:
+                # Include actual values
+                lines.extend(f"{var.get('key', '')}={var.get('value', '')}\n" for var in variables)
+            else:
+                # Leave values empty for security
+                lines.extend(f"{var.get('key', '')}=\n" for var in variables)
+            
+            # Write the whole file with a single write call
             with open(output_path, 'w') as f:
-                # Write header comments
-                f.write(f"# GitLab CI/CD Variables\n")
-                f.write(f"# Total: {len(variables)}\n")
-                f.write(f"# Sorted by: {sort}\n\n")
-                
-                # Write each variable as key=value
-                for var in variables:
-                    key = var.get('key', '')
-                    if include_values:
-                        # Include actual values
-                        value = var.get('value', '')
-                        f.write(f"{key}={value}\n")
-                    else:
-                        # Leave values empty for security
-                        f.write(f"{key}=\n")
+                f.write(''.join(lines))
             
             console.print(f"[green]✓[/green] Downloaded {len(variables)} variables to [bold]{output_path}[/bold]")
         
-        # Display download summary
-        console.print(f"[dim]Format: {format}[/dim]")
-        console.print(f"[dim]Sorted by: {sort}[/dim]")
+        # Display download summary (in one print call)
+        summary = [f"[dim]Format: {format}[/dim]", f"[dim]Sorted by: {sort}[/dim]"]
         
         # Warn if values were excluded
         if not include_values:
-            console.print("[yellow]Note: Values excluded for security. Use --include-values to include them.[/yellow]")
+            summary.append("[yellow]Note: Values excluded for security. Use --include-values to include them.[/yellow]")
+        
+        console.print('\n'.join(summary))
         
     except Exception as e:
         # Display error message if download fails
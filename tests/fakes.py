@@ -0,0 +1,135 @@
+"""
+In-memory stand-ins for the GitLab API and GitLabClient shared by the tests,
+and the setup they have in common. Importing this module puts the project on
+sys.path.
+
+Run the tests with:
+    python -m unittest discover tests
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import unquote
+
+import click
+import requests
+from click.testing import CliRunner
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gitlab_secrets  # noqa: E402
+from config import Config  # noqa: E402
+from gitlab_client import GitLabClient  # noqa: E402
+
+
+def make_config():
+    """Return the Config every fake client is built with."""
+    return Config(gitlab_url='https://gitlab.example.com', gitlab_token='token',
+                  project_id='1')
+
+
+def write_file(test, suffix, content):
+    """
+    Write content to a temporary file, removed when test finishes.
+    
+    Returns the file's path; suffix (e.g. '.env') selects the bulk loader.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    test.addCleanup(os.remove, path)
+    return path
+
+
+def make_variable(key, value='v', **fields):
+    """Return a variable dictionary shaped like the GitLab API's."""
+    variable = {'key': key, 'value': value, 'protected': False, 'masked': False,
+                'raw': False, 'environment_scope': '*', 'variable_type': 'env_var'}
+    variable.update(fields)
+    return variable
+
+
+class FakeClient:
+    """
+    Stands in for GitLabClient, serving and updating a list of variables.
+    
+    Updates setting a value listed in `delays` sleep that many seconds first,
+    to make concurrent requests finish out of order.
+    """
+    
+    def __init__(self, variables=(), delays=None):
+        self.variables = list(variables)
+        self.delays = delays or {}
+    
+    def list_variables(self, use_cache=False):
+        return list(self.variables)
+    
+    def get_variable(self, key, use_cache=False):
+        return next((var for var in self.variables if var['key'] == key), None)
+    
+    def update_variable(self, key, value=None, **kwargs):
+        time.sleep(self.delays.get(value, 0))
+        variable = self.get_variable(key)
+        if value is not None:
+            variable['value'] = value
+        variable.update(kwargs)
+        return variable
+
+
+def invoke(client, *args):
+    """
+    Run the CLI with the given arguments against client.
+    
+    Returns the click Result and its output with Rich's styling removed.
+    """
+    runner = CliRunner()
+    result = runner.invoke(gitlab_secrets.cli, list(args), obj={'client': client})
+    return result, click.unstyle(result.output)
+
+
+class FakeApi:
+    """
+    Serves the variables endpoints from a list, in place of GitLabClient._send.
+    
+    Every request is recorded in `requests` as (method, url, params). Listing
+    pages named in `page_delays` are answered after that many seconds.
+    """
+    
+    def __init__(self, variables=(), page_delays=None):
+        self.variables = list(variables)
+        self.page_delays = page_delays or {}
+        self.requests = []
+        self.lock = threading.Lock()
+    
+    def __call__(self, method, url, params=None, **kwargs):
+        with self.lock:
+            self.requests.append((method, url, params))
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        
+        _, _, key = url.partition('/variables/')
+        if method == 'GET' and not key:
+            time.sleep(self.page_delays.get(params['page'], 0))
+            per_page = params['per_page']
+            start = (params['page'] - 1) * per_page
+            body = self.variables[start:start + per_page]
+            response.headers['X-Total-Pages'] = str(max(1, -(-len(self.variables) // per_page)))
+        elif method == 'GET':
+            body = next((var for var in self.variables if var['key'] == unquote(key)), None)
+            if body is None:
+                response.status_code = 404
+        else:
+            raise AssertionError(f"FakeApi got an unexpected request: {method} {url}")
+        response._content = json.dumps(body).encode()
+        return response
+
+
+def make_client(api):
+    """Return a GitLabClient whose requests are answered by api."""
+    client = GitLabClient(make_config())
+    client._send = api
+    return client
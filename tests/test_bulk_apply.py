@@ -0,0 +1,79 @@
+"""
+Tests for bulk create/update from a file, run against an in-memory fake client.
+"""
+import json
+import unittest
+
+from fakes import FakeClient, invoke, make_variable, write_file
+
+
+class BulkUpdateOrderTest(unittest.TestCase):
+    """Rows for the same variable are applied in file order."""
+    
+    def setUp(self):
+        self.path = write_file(self, '.env', 'DUP=first\nOTHER=x\nDUP=second\nLAST=y\n')
+    
+    def test_later_row_wins_even_if_earlier_row_is_slow(self):
+        client = FakeClient([make_variable(key) for key in ('DUP', 'OTHER', 'LAST')],
+                            delays={'first': 0.2})
+        
+        result, output = invoke(client, 'update', '--file', self.path)
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertEqual(client.get_variable('DUP')['value'], 'second')
+        
+        # One line per row, in file order
+        keys = [line.split()[-1] for line in output.splitlines() if '✓' in line]
+        self.assertEqual(keys, ['DUP', 'OTHER', 'DUP', 'LAST'])
+
+
+class BulkUpdateScopeOrderTest(unittest.TestCase):
+    """Rows for one key with different environment scopes don't race."""
+    
+    def setUp(self):
+        self.path = write_file(self, '.json', json.dumps([
+            {'key': 'A', 'value': 'first', 'environment_scope': 'production'},
+            {'key': 'A', 'value': 'second', 'environment_scope': 'staging'},
+        ]))
+    
+    def test_later_row_wins_even_if_earlier_row_is_slow(self):
+        client = FakeClient([make_variable('A')], delays={'first': 0.2})
+        
+        result, output = invoke(client, 'update', '--file', self.path)
+        self.assertEqual(result.exit_code, 0, output)
+        variable = client.get_variable('A')
+        self.assertEqual(variable['value'], 'second')
+        self.assertEqual(variable['environment_scope'], 'staging')
+
+
+class BulkResultMarkupTest(unittest.TestCase):
+    """Keys and errors are printed literally, not as Rich markup."""
+    
+    def setUp(self):
+        self.path = write_file(self, '.env', '[/x]=first\nOK=second\n')
+    
+    def test_markup_in_a_failed_key_is_escaped(self):
+        client = FakeClient([make_variable('OK')])
+        
+        result, output = invoke(client, 'update', '--file', self.path)
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertIn('✗ [/x]:', output)
+        self.assertIn('✓ OK', output)
+        self.assertIn('Successfully updated: 1', output)
+        self.assertIn('Failed: 1', output)
+
+
+class BulkEmptyFileTest(unittest.TestCase):
+    """A file whose 'variables' list is null or empty has nothing to apply."""
+    
+    def test_null_or_empty_variables(self):
+        for content in ('variables:\n', 'variables: []\n'):
+            path = write_file(self, '.yaml', content)
+            for command in ('create', 'update'):
+                with self.subTest(content=content, command=command):
+                    result, output = invoke(FakeClient(), command, '--file', path)
+                    self.assertEqual(result.exit_code, 0, output)
+                    self.assertIn('No variables found in file', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for loading the configuration through the CLI.
+"""
+import unittest
+
+from click.testing import CliRunner
+
+import fakes  # noqa: F401  (puts the project on sys.path)
+import gitlab_secrets
+
+SETTINGS = {'GITLAB_URL': 'https://gitlab.example.com', 'GITLAB_TOKEN': 'token',
+            'GITLAB_PROJECT_ID': '1'}
+UNSET = dict.fromkeys(SETTINGS)
+
+
+class ConfigReloadTest(unittest.TestCase):
+    """A run without credentials does not break later in-process runs."""
+    
+    def test_settings_provided_after_a_failed_run_are_used(self):
+        runner = CliRunner()
+        # `read` with an invalid key stops right after loading the client,
+        # before any request is made
+        args = ['read', 'BAD KEY']
+        
+        result = runner.invoke(gitlab_secrets.cli, args,
+                               env={**UNSET, 'GITLAB_SECRETS_SKIP_DOTENV': '1'})
+        self.assertIn('environment variables are required', result.output)
+        
+        result = runner.invoke(gitlab_secrets.cli, args,
+                               env={**SETTINGS, 'GITLAB_SECRETS_SKIP_DOTENV': '1'})
+        self.assertNotIn('required', result.output)
+        self.assertIn('Invalid variable key', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for GitLabClient, run against an in-memory fake of the API.
+"""
+import unittest
+from unittest import mock
+
+from fakes import FakeApi, make_client, make_variable
+
+
+class CachedLookupTest(unittest.TestCase):
+    """get_variable(use_cache=True) answers like the API would."""
+    
+    def test_unique_key_is_answered_from_the_listing(self):
+        api = FakeApi([make_variable('A'), make_variable('B')])
+        client = make_client(api)
+        client.list_variables()
+        fetched = len(api.requests)
+        
+        self.assertEqual(client.get_variable('B', use_cache=True)['key'], 'B')
+        self.assertIsNone(client.get_variable('MISSING', use_cache=True))
+        self.assertEqual(len(api.requests), fetched)
+    
+    def test_key_in_several_scopes_is_fetched_from_the_api(self):
+        api = FakeApi([
+            make_variable('DB', 'prod-url', environment_scope='production'),
+            make_variable('DB', 'stage-url', environment_scope='staging'),
+        ])
+        client = make_client(api)
+        client.list_variables()
+        fetched = len(api.requests)
+        
+        self.assertEqual(client.get_variable('DB', use_cache=True),
+                         client.get_variable('DB'))
+        self.assertEqual(len(api.requests), fetched + 2)
+    
+    def test_cached_listing_expires(self):
+        api = FakeApi([make_variable('A')])
+        client = make_client(api)
+        with mock.patch('gitlab_client.time.monotonic', return_value=1000.0):
+            client.list_variables()
+        fetched = len(api.requests)
+        
+        with mock.patch('gitlab_client.time.monotonic', return_value=1005.0):
+            client.list_variables(use_cache=True)
+        self.assertEqual(len(api.requests), fetched)
+        
+        api.variables.append(make_variable('B'))
+        with mock.patch('gitlab_client.time.monotonic', return_value=1060.0):
+            self.assertEqual(len(client.list_variables(use_cache=True)), 2)
+            self.assertEqual(client.get_variable('B', use_cache=True)['key'], 'B')
+
+
+class IterVariablesTest(unittest.TestCase):
+    """iter_variables() prefetches a bounded window of pages, in order."""
+    
+    def setUp(self):
+        # 10 pages of 100 variables
+        self.variables = [make_variable(f'VAR_{i:04d}') for i in range(1000)]
+    
+    def requested_pages(self, api):
+        return sorted(params['page'] for _, _, params in api.requests)
+    
+    def test_pages_come_back_in_order(self):
+        # Slow early pages must not let later ones overtake them
+        api = FakeApi(self.variables, page_delays={2: 0.1, 3: 0.05})
+        keys = [var['key'] for var in make_client(api).iter_variables()]
+        self.assertEqual(keys, [var['key'] for var in self.variables])
+        self.assertEqual(self.requested_pages(api), list(range(1, 11)))
+    
+    def test_stopping_after_page_two_skips_the_rest(self):
+        api = FakeApi(self.variables)
+        variables = make_client(api).iter_variables(prefetch=2)
+        for i, _ in enumerate(variables):
+            if i == 150:
+                break
+        # Closing waits for the requests in flight and cancels the others
+        variables.close()
+        
+        # Pages 1 and 2 were consumed; at most `prefetch` more were requested
+        pages = self.requested_pages(api)
+        self.assertEqual(pages[:3], [1, 2, 3])
+        self.assertLessEqual(len(pages), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for AsyncGitLabClient, run against an in-memory fake aiohttp session.
+
+Skipped when aiohttp (an optional dependency) is not installed.
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+from urllib.parse import unquote
+
+from fakes import make_config, make_variable
+
+from gitlab_client import VariableConflictError
+
+try:
+    import aiohttp
+    import gitlab_client_async
+except ImportError:
+    aiohttp = None
+
+
+class FakeResponse:
+    """Just enough of aiohttp.ClientResponse for AsyncGitLabClient."""
+    
+    reason = 'Fake'
+    request_info = None
+    history = ()
+    
+    def __init__(self, url, status=200, body=None, headers=None):
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self._body = b'' if body is None else json.dumps(body).encode()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        pass
+    
+    async def read(self):
+        return self._body
+    
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(self.request_info, self.history,
+                                             status=self.status, message=self.reason)
+
+
+class FakeSession:
+    """
+    Serves the variables endpoints from a list, in place of aiohttp.ClientSession.
+    
+    Every request is recorded in `requests` as (method, url, decoded JSON body).
+    """
+    
+    def __init__(self, variables=()):
+        self.variables = list(variables)
+        self.requests = []
+    
+    def find(self, key):
+        return next((var for var in self.variables if var['key'] == key), None)
+    
+    def request(self, method, url, params=None, **kwargs):
+        # Bodies come as `json`, or as orjson-encoded `data`
+        body = kwargs['json'] if 'json' in kwargs else json.loads(kwargs.get('data', 'null'))
+        self.requests.append((method, url, body))
+        
+        _, _, key = url.partition('/variables/')
+        variable = self.find(unquote(key)) if key else None
+        if method == 'GET' and not key:
+            per_page = params['per_page']
+            start = (params['page'] - 1) * per_page
+            total_pages = max(1, -(-len(self.variables) // per_page))
+            return FakeResponse(url, body=self.variables[start:start + per_page],
+                                headers={'X-Total-Pages': str(total_pages)})
+        if method == 'POST':
+            if self.find(body['key']) is not None:
+                return FakeResponse(url, 409, {'message': 'already exists'})
+            self.variables.append(make_variable(**body))
+            return FakeResponse(url, 201, self.variables[-1])
+        if variable is None:
+            return FakeResponse(url, 404, {'message': '404 Not found'})
+        if method == 'PUT':
+            variable.update(body)
+            return FakeResponse(url, body=variable)
+        raise AssertionError(f"FakeSession got an unexpected request: {method} {url}")
+    
+    async def close(self):
+        pass
+
+
+def make_async_client(session):
+    """Return an AsyncGitLabClient whose requests are answered by session."""
+    client = gitlab_client_async.AsyncGitLabClient(make_config())
+    client._session = session
+    return client
+
+
+@unittest.skipUnless(aiohttp, "aiohttp is not installed")
+class AsyncClientTest(unittest.TestCase):
+    """AsyncGitLabClient behaves like GitLabClient."""
+    
+    def test_list_variables_reads_every_page_in_order(self):
+        variables = [make_variable(f'VAR_{i:03d}') for i in range(250)]
+        session = FakeSession(variables)
+        
+        listed = asyncio.run(make_async_client(session).list_variables())
+        self.assertEqual([var['key'] for var in listed], [var['key'] for var in variables])
+        self.assertEqual(len(session.requests), 3)
+    
+    def test_create_existing_variable_raises_conflict_error(self):
+        client = make_async_client(FakeSession([make_variable('A')]))
+        with self.assertRaises(gitlab_client_async.AsyncConflictError) as caught:
+            asyncio.run(client.create_variable('A', 'v'))
+        self.assertIsInstance(caught.exception, VariableConflictError)
+        self.assertEqual(caught.exception.status, 409)
+    
+    def test_bulk_upsert_updates_or_creates(self):
+        # With and without orjson encoding the request bodies
+        for orjson in {gitlab_client_async.orjson, None}:
+            with self.subTest(orjson=orjson), \
+                    mock.patch.object(gitlab_client_async, 'orjson', orjson):
+                session = FakeSession([make_variable('OLD')])
+                results = asyncio.run(make_async_client(session).bulk_upsert(
+                    [('OLD', 'new', {}), ('NEW', 'v', {'masked': True})]))
+                
+                self.assertEqual([(key, var['value']) for key, var in results],
+                                 [('OLD', 'new'), ('NEW', 'v')])
+                self.assertTrue(session.find('NEW')['masked'])
+                # NEW is only POSTed after its PUT came back 404
+                self.assertEqual([method for method, url, _ in session.requests
+                                  if url.endswith('NEW') or method == 'POST'],
+                                 ['PUT', 'POST'])
+
+
+if __name__ == '__main__':
+    unittest.main()
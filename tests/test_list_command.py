@@ -0,0 +1,55 @@
+"""
+Tests for the list command, run against an in-memory fake client.
+"""
+import unittest
+
+from fakes import FakeClient, invoke, make_variable
+
+import gitlab_secrets
+
+
+class ListCellTextTest(unittest.TestCase):
+    """Field values are shown the way the table always showed them."""
+    
+    def test_null_value_is_an_empty_cell(self):
+        # GitLab returns a null value for hidden variables
+        client = FakeClient([make_variable('HIDDEN', None, masked=True)])
+        
+        result, output = invoke(client, 'list', '--show-values', '--plain')
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertIn('HIDDEN\t\tFalse\tTrue\tFalse\t*\n', output)
+        
+        result, output = invoke(client, 'list', '--show-values', '--no-plain')
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertNotIn('None', output)
+    
+    def test_only_booleans_use_the_flag_text(self):
+        cell_text = gitlab_secrets._cell_text
+        self.assertEqual([cell_text(v) for v in (True, False, 1, 0, 1.0, 0.0)],
+                         ['True', 'False', '1', '0', '1.0', '0.0'])
+        self.assertEqual(cell_text(['a']), "['a']")
+
+
+class ListOutputModeTest(unittest.TestCase):
+    """Large listings print TSV unless --no-plain asks for the table."""
+    
+    def setUp(self):
+        count = gitlab_secrets._PLAIN_OUTPUT_THRESHOLD
+        self.client = FakeClient([make_variable(f'VAR_{i:04d}') for i in range(count)])
+    
+    def test_large_listing_prints_tsv_by_default(self):
+        result, output = invoke(self.client, 'list')
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertTrue(output.startswith('key\tprotected\tmasked\traw\tenvironment_scope\n'))
+        self.assertNotIn('Total:', output)
+    
+    def test_no_plain_keeps_the_table(self):
+        result, output = invoke(self.client, 'list', '--no-plain')
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertNotIn('\t', output)
+        self.assertIn('GitLab CI/CD Variables', output)
+        self.assertIn('Total: 1000 variables', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+"""
+Tests for the read command, run against an in-memory fake client.
+"""
+import unittest
+
+from fakes import FakeClient, invoke, make_variable
+
+
+class ReadDetailTableTest(unittest.TestCase):
+    """The detail table shows each property the way it always did."""
+    
+    def test_null_value_is_an_empty_cell(self):
+        # GitLab returns a null value for hidden variables
+        client = FakeClient([make_variable('HIDDEN', None, masked=True)])
+        
+        result, output = invoke(client, 'read', 'HIDDEN')
+        self.assertEqual(result.exit_code, 0, output)
+        self.assertNotIn('None', output)
+        self.assertRegex(output, r'Masked\s+│\s+True')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Regression tests for the YAML writers used by the download command.
+"""
+import io
+import unittest
+
+import yaml
+
+import fakes  # noqa: F401  (puts the project on sys.path)
+import gitlab_secrets
+
+
+# Values PyYAML writes as keep-chomped ("|+") block scalars, which end the
+# document with a "..." marker when they are the last thing dumped
+TRAILING_BLANK_LINES = ['cert\n\n', '\n\n', '-----BEGIN CERT-----\nabc\n\n\n']
+
+
+class WriteSimpleYamlTest(unittest.TestCase):
+    """_write_simple_yaml() output must load back as the mapping written."""
+    
+    def assertRoundTrips(self, data):
+        gitlab_secrets._ensure_multiline_presenter()
+        for dumper in {gitlab_secrets._yaml_dumper(), yaml.SafeDumper}:
+            with self.subTest(dumper=dumper.__name__):
+                f = io.StringIO()
+                gitlab_secrets._write_simple_yaml(f, data, dumper)
+                self.assertEqual(yaml.safe_load(f.getvalue()), data)
+    
+    def test_value_ending_in_blank_line_followed_by_entries(self):
+        for value in TRAILING_BLANK_LINES:
+            with self.subTest(value=value):
+                self.assertRoundTrips({'CERT': value, 'NEXT': 'value', 'OTHER': 'a: b'})
+    
+    def test_value_ending_in_blank_line_last(self):
+        for value in TRAILING_BLANK_LINES:
+            with self.subTest(value=value):
+                self.assertRoundTrips({'FIRST': 'value', 'CERT': value})
+
+
+class WriteYamlDocumentTest(unittest.TestCase):
+    """_write_yaml_document() output must load back as the document written."""
+    
+    def test_description_ending_in_blank_line_at_chunk_boundaries(self):
+        gitlab_secrets._ensure_multiline_presenter()
+        # GitLab returns 'description' last, so it ends each record and, for
+        # the last record of a chunk, the whole chunk
+        records = [
+            {'key': f'VAR_{i}', 'value': 'v', 'description': TRAILING_BLANK_LINES[i % 3]}
+            for i in range(gitlab_secrets._YAML_CHUNK_SIZE * 2 + 1)
+        ]
+        expected = {'variables': records, 'total': len(records), 'sorted_by': 'key'}
+        for dumper in {gitlab_secrets._yaml_dumper(), yaml.SafeDumper}:
+            with self.subTest(dumper=dumper.__name__):
+                f = io.StringIO()
+                gitlab_secrets._write_yaml_document(f, iter(records), len(records), 'key', dumper)
+                self.assertEqual(yaml.safe_load(f.getvalue()), expected)
+
+
+class MultilinePresenterTest(unittest.TestCase):
+    """The multiline presenter is registered on the download dumper only."""
+    
+    def test_default_dumper_is_left_alone(self):
+        gitlab_secrets._ensure_multiline_presenter()
+        presenter = gitlab_secrets.multiline_str_presenter
+        self.assertIs(gitlab_secrets._yaml_dumper().yaml_representers[str], presenter)
+        self.assertIsNot(yaml.Dumper.yaml_representers[str], presenter)
+
+
+if __name__ == '__main__':
+    unittest.main()